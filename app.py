@@ -16,6 +16,40 @@ def create_app(config_class=Config):
     # Import models so Alembic can detect them
     from src import models
 
+    # Cached latest valuation + chart series follow every appraisal write
+    from src.services.valuation_service import init_valuation_tracking
+    init_valuation_tracking()
+
+    # Full-text search index (FTS5) follows every write to the searchable tables
+    from src.services.search_service import init_search_index
+    init_search_index(app)
+
+    # Row-level change log behind incremental backups (triggers come from create_all / migrations)
+    from src.services.changelog_service import init_change_log
+    init_change_log(app)
+
+    # SQLite pragmas on every connection (journal mode, cache, busy timeout)
+    from src.sqlite_tuning import init_sqlite_tuning
+    init_sqlite_tuning(app)
+
+    # Read-only page cache + data version bumped on every committed write
+    from src.page_cache import init_page_cache
+    init_page_cache(app)
+
+    # Gzip + content-hashed static URLs with far-future caching
+    from src.compression import init_compression
+    from src.static_assets import init_static_assets
+    init_compression(app)
+    init_static_assets(app)
+
+    # Opt-in request profiling (no-op unless PERF_INSTRUMENTATION is set)
+    from src.instrumentation import init_instrumentation
+    init_instrumentation(app)
+
+    # `flask snapshots ...`: scheduled database snapshots, run outside the web workers
+    from src.services.snapshot_service import init_snapshots
+    init_snapshots(app)
+
     # --- CUSTOM FILTERS ---
     @app.template_filter('currency')
     def currency_filter(value):
@@ -33,11 +67,13 @@ def create_app(config_class=Config):
     from src.routes.main import bp as main_bp
     from src.routes.settings import bp as settings_bp
     from src.routes.manage import bp as manage_bp
+    from src.routes.api import bp as api_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(settings_bp)
     app.register_blueprint(manage_bp)
+    app.register_blueprint(api_bp)
 
     return app
 
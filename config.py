@@ -9,6 +9,54 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD')
 
+    # SQLite engine profile (see src/sqlite_tuning.py). WAL is opt-in: it breaks on Windows Docker mounts.
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'DELETE')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS')  # default: NORMAL with WAL, FULL otherwise
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 65536))
+    SQLITE_MMAP_SIZE = int(os.environ['SQLITE_MMAP_SIZE']) if os.environ.get('SQLITE_MMAP_SIZE') else None  # default: 256MB with WAL, off otherwise
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_FOREIGN_KEYS = os.environ.get('SQLITE_FOREIGN_KEYS', '').lower() in ('1', 'true', 'yes')
+
+    # Charts: max points sent to the browser per series ('lttb' or 'monthly' downsampling)
+    CHART_MAX_POINTS = int(os.environ.get('CHART_MAX_POINTS', 400))
+    CHART_DOWNSAMPLE = os.environ.get('CHART_DOWNSAMPLE', 'lttb')
+
+    # Assets page: items per section per page
+    ASSETS_PAGE_SIZE = int(os.environ.get('ASSETS_PAGE_SIZE', 60))
+
+    # Timeline: events per section per page
+    TIMELINE_PAGE_SIZE = int(os.environ.get('TIMELINE_PAGE_SIZE', 100))
+
+    # Contacts: professional contacts per page
+    CONTACTS_PAGE_SIZE = int(os.environ.get('CONTACTS_PAGE_SIZE', 48))
+
+    # Page cache for read-only views (invalidated by any committed write, see src/page_cache.py)
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    PAGE_CACHE_SIZE = int(os.environ.get('PAGE_CACHE_SIZE', 64))
+
+    # Gzip for text responses; far-future caching of fingerprinted static files
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 31536000))
+    VENDOR_DIR = os.environ.get('VENDOR_DIR')  # vendor scripts fetched by the image build (see src/static_assets.py)
+
+    # Scheduled snapshots, taken by `flask snapshots run` (see src/services/snapshot_service.py)
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')  # default: instance/backups
+    SNAPSHOT_INTERVAL_MINUTES = int(os.environ.get('SNAPSHOT_INTERVAL_MINUTES', 60))
+    SNAPSHOT_PAGES_PER_STEP = int(os.environ.get('SNAPSHOT_PAGES_PER_STEP', 256))
+    SNAPSHOT_STEP_SLEEP_MS = int(os.environ.get('SNAPSHOT_STEP_SLEEP_MS', 50))
+    SNAPSHOT_KEEP_RECENT = int(os.environ.get('SNAPSHOT_KEEP_RECENT', 6))
+    SNAPSHOT_KEEP_DAILY = int(os.environ.get('SNAPSHOT_KEEP_DAILY', 7))
+    SNAPSHOT_KEEP_WEEKLY = int(os.environ.get('SNAPSHOT_KEEP_WEEKLY', 4))
+    SNAPSHOT_KEEP_MONTHLY = int(os.environ.get('SNAPSHOT_KEEP_MONTHLY', 12))
+
+    # Request profiling (Server-Timing headers, slow query log, /settings/performance)
+    PERF_INSTRUMENTATION = os.environ.get('PERF_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+    PERF_SLOW_QUERY_MS = float(os.environ.get('PERF_SLOW_QUERY_MS', 100))
+    PERF_WINDOW = int(os.environ.get('PERF_WINDOW', 200))
+
     @staticmethod
     def init_app(app):
         # Security Check
@@ -90,9 +90,19 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # The FTS5 search index (and its shadow tables) is managed by hand, not
+    # by the models; keep autogenerate from proposing to drop it
+    def include_name(name, type_, parent_names):
+        return not (type_ == 'table' and name.startswith('search_index'))
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
+
+    # Steps applied by this run (none for `check`, `current`, autogenerate)
+    applied = []
+    conf_args.setdefault("on_version_apply", lambda **kw: applied.append(kw['step']))
 
     connectable = get_engine()
 
@@ -106,6 +116,14 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+            # Batch migrations rebuild their table, which drops its change
+            # log triggers (src/services/changelog_service.py); put them back
+            if applied:
+                from src.services.changelog_service import install_missing_triggers
+                restored = install_missing_triggers(connection)
+                if restored:
+                    logger.info('Restored %d change log triggers.', restored)
+
 
 if context.is_offline_mode():
     run_migrations_offline()
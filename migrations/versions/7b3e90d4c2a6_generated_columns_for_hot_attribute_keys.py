@@ -0,0 +1,63 @@
+"""Generated columns for hot attribute keys
+
+Revision ID: 7b3e90d4c2a6
+Revises: a41e7c9b2d18
+Create Date: 2026-10-17 23:52:08.402317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e90d4c2a6'
+down_revision = 'a41e7c9b2d18'
+branch_labels = None
+depends_on = None
+
+
+def _attr_text(key):
+    return f"NULLIF(trim(json_extract(attributes, '$.{key}')), '')"
+
+
+def _attr_date(key):
+    raw = f"json_extract(attributes, '$.{key}')"
+    return f"CASE WHEN date({raw}) = {raw} THEN {raw} END"
+
+
+def _attr_number(key):
+    return (f"CASE WHEN json_type(attributes, '$.{key}') IN ('integer', 'real') "
+            f"THEN json_extract(attributes, '$.{key}') END")
+
+
+COLUMNS = [
+    ('purchase_date', sa.Date(), _attr_date('purchase_date')),
+    ('purchase_price', sa.Float(), _attr_number('purchase_price')),
+    ('institution', sa.String(length=150), _attr_text('institution')),
+    ('account_type', sa.String(length=50), _attr_text('account_type')),
+    ('vin', sa.String(length=50), _attr_text('vin')),
+    ('address', sa.String(length=255), _attr_text('address')),
+]
+
+
+def upgrade():
+    # VIRTUAL generated columns: SQLite computes them from `attributes` for
+    # every existing row, so there is nothing to copy. Building each index
+    # evaluates the expression once per row (the backfill).
+    with op.batch_alter_table('asset', schema=None) as batch_op:
+        for name, type_, expression in COLUMNS:
+            batch_op.add_column(sa.Column(name, type_, sa.Computed(expression, persisted=False), nullable=True))
+
+    with op.batch_alter_table('asset', schema=None) as batch_op:
+        for name, _, _ in COLUMNS:
+            batch_op.create_index(batch_op.f(f'ix_asset_{name}'), [name], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('asset', schema=None) as batch_op:
+        for name, _, _ in reversed(COLUMNS):
+            batch_op.drop_index(batch_op.f(f'ix_asset_{name}'))
+
+    with op.batch_alter_table('asset', schema=None) as batch_op:
+        for name, _, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
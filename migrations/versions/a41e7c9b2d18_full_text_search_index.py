@@ -0,0 +1,51 @@
+"""Full text search index
+
+Revision ID: a41e7c9b2d18
+Revises: 65d816314e10
+Create Date: 2026-10-17 23:31:52.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41e7c9b2d18'
+down_revision = '65d816314e10'
+branch_labels = None
+depends_on = None
+
+
+def _json_text(column):
+    return (f"(SELECT group_concat(CASE WHEN typeof(key) = 'text' THEN key || ' ' ELSE '' END || value, ' ') "
+            f"FROM json_tree({column}) WHERE type NOT IN ('object', 'array'))")
+
+
+def _join(*parts):
+    return " || ' ' || ".join(f"coalesce({p}, '')" for p in parts)
+
+
+# Snapshot of search_service.SOURCES at this revision: (table, kind, code, asset_id, title, body)
+DOCUMENTS = [
+    ('asset', 'asset', 1, 'id', 'name', _join('asset_type', _json_text('attributes'))),
+    ('location_point', 'pin', 2, 'asset_id', 'label', _join('description')),
+    ('property_structure', 'structure', 3, 'asset_id', 'name', _join('structure_type', 'description', 'notes')),
+    ('recurring_bill', 'bill', 4, 'asset_id', 'name', _join('payee', 'account_number', 'frequency', 'notes')),
+    ('asset_vendor', 'vendor', 5, 'asset_id', 'role', _join('notes')),
+    ('person', 'person', 6, 'NULL', 'name', _join('role', 'email', 'phone', _json_text('attributes'))),
+]
+
+
+def upgrade():
+    # FTS5 virtual table; kept current by src/services/search_service.py from here on
+    op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+               "kind UNINDEXED, asset_id UNINDEXED, title, body, tokenize='porter unicode61')")
+    for table, kind, code, asset_id, title, body in DOCUMENTS:
+        op.execute(
+            f"INSERT INTO search_index (rowid, kind, asset_id, title, body) "
+            f"SELECT id * 8 + {code}, '{kind}', {asset_id}, {title}, {body} FROM {table}"
+        )
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,158 @@
+"""
+View-level benchmark: generates synthetic estates of several sizes and drives
+the main pages, the backup download and the restore through the Flask test
+client, recording latency and SQL statement counts.
+
+    python scripts/benchmark.py
+    python scripts/benchmark.py --sizes small,large --repeat 10 --output bench.json
+    python scripts/benchmark.py --compare bench.json
+
+Runs against a throwaway SQLite file, never the configured database.
+"""
+import sys
+import os
+import io
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+# Add project root to path so imports work
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('ADMIN_PASSWORD', 'benchmark')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+from sqlalchemy import event
+from app import create_app
+from config import Config
+from src.extensions import db
+from generate_estate import PRESETS, generate_estate
+
+
+# (label, method, path)
+SCENARIOS = [
+    ('dashboard', 'GET', '/'),
+    ('dashboard_chart', 'GET', '/chart.json'),
+    ('assets_view', 'GET', '/assets'),
+    ('assets_by_name', 'GET', '/assets?sort=name'),
+    ('asset_details', 'GET', '/asset/1'),
+    ('asset_chart', 'GET', '/asset/1/chart.json'),
+    ('asset_tab_pins', 'GET', '/asset/1/tab/pins'),
+    ('asset_tab_bills', 'GET', '/asset/1/tab/bills'),
+    ('timeline_view', 'GET', '/timeline'),
+    ('contacts_view', 'GET', '/contacts'),
+    ('api_networth_month', 'GET', '/api/networth?resolution=month'),
+    ('api_networth_year', 'GET', '/api/networth?resolution=year'),
+    ('forecast_60', 'GET', '/forecast?months=60'),
+    ('backup_download', 'GET', '/settings/download'),
+    ('restore', 'POST', '/settings/upload'),
+]
+
+
+def make_config(db_path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        WTF_CSRF_ENABLED = False
+        PAGE_CACHE_ENABLED = False  # measure the views, not the page cache
+    return BenchConfig
+
+
+def timed_request(client, method, path, statements, backup=None):
+    del statements[:]
+    started = time.perf_counter()
+    if method == 'POST':
+        response = client.post(path, data={'backup_file': (io.BytesIO(backup), 'estate_backup.zip')},
+                               content_type='multipart/form-data')
+    else:
+        response = client.get(path)
+        response.get_data()  # drain streamed responses inside the timing
+    elapsed = (time.perf_counter() - started) * 1000
+    assert response.status_code in (200, 302), f"{method} {path} returned {response.status_code}"
+    return elapsed, len(statements), response
+
+
+def run_size(name, counts, repeat, seed):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, 'bench.db')))
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['is_admin'] = True
+
+        results = {}
+        with app.app_context():
+            started = time.perf_counter()
+            written = generate_estate(counts, seed=seed)
+            results['_generate'] = {'ms': (time.perf_counter() - started) * 1000, 'rows': written}
+
+            statements = []
+            event.listen(db.engine, 'before_cursor_execute',
+                         lambda conn, cursor, statement, *args: statements.append(statement))
+
+            backup = None
+            for label, method, path in SCENARIOS:
+                timings, queries = [], 0
+                # One warm-up pass (template compilation, lazy series bootstrap) is not recorded
+                for i in range(repeat + 1):
+                    elapsed, queries, response = timed_request(client, method, path, statements, backup)
+                    if label == 'backup_download':
+                        backup = response.get_data()
+                    if i:
+                        timings.append(elapsed)
+                    db.session.remove()
+                results[label] = {
+                    'median_ms': statistics.median(timings),
+                    'min_ms': min(timings),
+                    'max_ms': max(timings),
+                    'queries': queries,
+                }
+                if label == 'backup_download':
+                    results[label]['bytes'] = len(backup)
+            db.engine.dispose()
+    return results
+
+
+def print_report(name, counts, results, baseline=None):
+    print(f"\n== {name}: {counts['assets']} assets x {counts['appraisals']} appraisals "
+          f"(generated in {results['_generate']['ms'] / 1000:.1f}s) ==")
+    print(f"   {'scenario':<18}{'median ms':>11}{'min':>9}{'max':>9}{'queries':>9}{'vs base':>10}")
+    for label, _, _ in SCENARIOS:
+        r = results[label]
+        delta = ''
+        previous = (baseline or {}).get(name, {}).get(label)
+        if previous:
+            delta = f"{(r['median_ms'] / previous['median_ms'] - 1) * 100:+.0f}%"
+            if r['queries'] != previous['queries']:
+                delta += f" q{r['queries'] - previous['queries']:+d}"
+        print(f"   {label:<18}{r['median_ms']:>11.1f}{r['min_ms']:>9.1f}{r['max_ms']:>9.1f}{r['queries']:>9}{delta:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='small,medium,large', help='comma separated presets from generate_estate.py')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON for later --compare')
+    parser.add_argument('--compare', help='JSON results of a previous run to diff against')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    report = {'seed': args.seed, 'repeat': args.repeat, 'results': {}}
+    for name in args.sizes.split(','):
+        counts = PRESETS[name.strip()]
+        results = run_size(name, counts, args.repeat, args.seed)
+        report['results'][name] = results
+        print_report(name, counts, results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Guard against N+1 regressions: renders a page against a small and a large
+estate and fails if the number of SQL statements grows with the data.
+
+    python scripts/check_query_counts.py
+"""
+import sys
+import os
+from datetime import date, timedelta
+
+# Add project root to path so imports work
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('ADMIN_PASSWORD', 'query-count-check')
+os.environ.setdefault('SECRET_KEY', 'query-count-check')
+
+from sqlalchemy import event, insert
+from app import create_app
+from config import Config
+from src.extensions import db
+from src.models import Person, Asset, Appraisal, PropertyStructure, RecurringBill, AssetVendor, asset_beneficiaries
+
+
+class CheckConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    PAGE_CACHE_ENABLED = False  # measure the views, not the page cache
+
+
+# Pages that must issue a constant number of queries
+PAGES = ['/', '/chart.json', '/assets', '/assets?sort=appraised&order=asc&type=RealEstate&trust=1&owner=1',
+         '/asset/1', '/asset/1/chart.json', '/timeline', '/contacts',
+         '/contacts?pros_after=2|Person 2',
+         '/asset/1/tab/history', '/asset/1/tab/structures', '/asset/1/tab/pins', '/asset/1/tab/bills',
+         '/asset/1/tab/vendors',
+         '/api/networth', '/api/asset/1/valuations?resolution=week', '/search?q=asset', '/forecast?months=60']
+
+
+def populate(asset_count):
+    """
+    Bulk-insert asset_count assets, each with a purchase date, appraisals, a bill,
+    a structure, an owner, a beneficiary and a vendor.
+    """
+    db.drop_all()
+    db.create_all()
+    start = date(2005, 1, 1)
+    db.session.execute(insert(Person), [
+        {'id': i, 'name': f'Person {i}', 'role': 'Beneficiary' if i % 2 else 'Vendor'}
+        for i in range(1, asset_count + 1)
+    ])
+    db.session.execute(insert(Asset), [
+        {'id': i, 'name': f'Asset {i}', 'asset_type': 'RealEstate', 'value_estimated': 1000.0 * i,
+         'owner_id': i, 'attributes': {'purchase_date': (start + timedelta(days=i)).isoformat()}}
+        for i in range(1, asset_count + 1)
+    ])
+    db.session.execute(insert(asset_beneficiaries), [
+        {'asset_id': i, 'person_id': i, 'percentage': 100.0} for i in range(1, asset_count + 1)
+    ])
+    db.session.execute(insert(AssetVendor), [
+        {'asset_id': i, 'person_id': i, 'role': 'Gardener'} for i in range(1, asset_count + 1)
+    ])
+    db.session.execute(insert(Appraisal), [
+        {'asset_id': i, 'date': start + timedelta(days=i + 30 * n), 'value': 1000.0 * i + n, 'source': 'Check'}
+        for i in range(1, asset_count + 1) for n in range(3)
+    ])
+    db.session.execute(insert(RecurringBill), [
+        {'asset_id': i, 'name': 'Tax', 'payee': 'County', 'amount_estimated': 100.0,
+         'next_due_date': date.today() + timedelta(days=i)}
+        for i in range(1, asset_count + 1)
+    ])
+    db.session.execute(insert(PropertyStructure), [
+        {'asset_id': i, 'name': 'Shed', 'date_last_maintained': start + timedelta(days=i)}
+        for i in range(1, asset_count + 1)
+    ])
+    db.session.commit()
+
+
+def count_queries(app, client, path):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert response.status_code == 200, f"{path} returned {response.status_code}"
+    return len(statements)
+
+
+def main():
+    app = create_app(CheckConfig)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+
+    failures = 0
+    with app.app_context():
+        for path in PAGES:
+            counts = {}
+            for size in (5, 200):
+                populate(size)
+                counts[size] = count_queries(app, client, path)
+            ok = counts[5] == counts[200]
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {path}: {counts[5]} queries @5 assets, {counts[200]} @200 assets")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
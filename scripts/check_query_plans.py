@@ -0,0 +1,145 @@
+"""
+Guard against missing indexes: runs EXPLAIN QUERY PLAN for the app's key
+queries and fails if any of them falls back to a full table scan.
+
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py -v   # print every plan
+
+Key queries are captured as the app issues them: page renders (asset detail,
+contacts, a dated timeline window) plus the lookups the edit routes and the
+valuation series make.
+"""
+import sys
+import os
+import re
+from datetime import date, timedelta
+
+# Add project root to path so imports work
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('ADMIN_PASSWORD', 'query-plan-check')
+os.environ.setdefault('SECRET_KEY', 'query-plan-check')
+
+from sqlalchemy import event, select
+from app import create_app
+from config import Config
+from src.extensions import db
+from src.models import Person, Asset, Appraisal, PropertyStructure, RecurringBill, AssetVendor, Task, ValuationPoint
+from generate_estate import PRESETS, generate_estate
+
+
+class CheckConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    PAGE_CACHE_ENABLED = False  # measure the views, not the page cache
+
+
+today = date.today()
+
+# Pages whose every statement must be index-driven
+PAGES = [
+    '/assets',
+    '/assets?sort=name&assets_after=3|=Asset 3',
+    '/assets?sort=appraised&order=asc',
+    '/assets?type=RealEstate',
+    '/assets?sort=type&trust=0',
+    '/asset/1',
+    '/asset/1/chart.json',
+    '/asset/1/tab/vendors',
+    '/contacts',
+    '/timeline?' + '&'.join(f'type={t}' for t in ('milestone', 'financial', 'task', 'asset', 'history', 'maintenance'))
+    + f'&from={today - timedelta(days=30)}&to={today + timedelta(days=30)}',
+]
+
+# (label, statement) lookups made outside the read-only pages
+KEY_QUERIES = [
+    ('latest appraisal of an asset',
+     select(Appraisal).filter_by(asset_id=1).order_by(Appraisal.date.desc()).limit(1)),
+    ('appraisal history of an asset',
+     select(Appraisal.date, Appraisal.value).where(Appraisal.asset_id == 1).order_by(Appraisal.date, Appraisal.id)),
+    ('valuation series of an asset',
+     select(ValuationPoint.date, ValuationPoint.value).where(ValuationPoint.asset_id == 1).order_by(ValuationPoint.date)),
+    ('bills due in the next 30 days',
+     select(RecurringBill).where(RecurringBill.next_due_date.between(today, today + timedelta(days=30)))
+     .order_by(RecurringBill.next_due_date)),
+    ('tasks due from today',
+     select(Task).where(Task.due_date >= today).order_by(Task.due_date).limit(20)),
+    ('structures needing maintenance',
+     select(PropertyStructure).where(PropertyStructure.date_last_maintained < today - timedelta(days=365))
+     .order_by(PropertyStructure.date_last_maintained)),
+    ('vendors of an asset', select(AssetVendor).where(AssetVendor.asset_id == 1)),
+    ('service jobs of a contact', select(AssetVendor).where(AssetVendor.person_id == 1)),
+    ('assets owned by a contact', select(Asset).where(Asset.owner_id == 1)),
+    ('contacts by name', select(Person).order_by(Person.name)),
+    ('assets by VIN', select(Asset.id).where(Asset.vin == 'VIN0001')),
+    ('accounts at an institution', select(Asset.id, Asset.name).where(Asset.institution == 'Vanguard')),
+    ('assets by purchase price', select(Asset.id, Asset.purchase_price).order_by(Asset.purchase_price.desc()).limit(20)),
+]
+
+# "SCAN appraisal" is a full scan; "SCAN person USING INDEX ..." walks an index and is fine.
+# Scans of subqueries/CTEs (the timeline UNION) and constant rows are not table scans.
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?! USING)(?:\s|$)')
+
+
+def capture(run):
+    """Runs run() and returns every (statement, parameters) it sent to SQLite."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return statements
+
+
+def full_scans(statement, parameters):
+    """Returns (plan lines, tables read by a full scan)."""
+    tables = set(db.metadata.tables)
+    plan = [row[3] for row in db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+    scanned = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        if match and match.group(1) in tables:
+            scanned.append(match.group(1))
+    return plan, scanned
+
+
+def main():
+    verbose = '-v' in sys.argv
+    app = create_app(CheckConfig)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+
+    failures = 0
+    with app.app_context():
+        generate_estate(PRESETS['small'], seed=1)
+
+        checks = []
+        for path in PAGES:
+            def render(path=path):
+                response = client.get(path)
+                assert response.status_code == 200, f"{path} returned {response.status_code}"
+            checks += [(path, s, p) for s, p in capture(render)]
+        for label, stmt in KEY_QUERIES:
+            checks += [(label, s, p) for s, p in capture(lambda: db.session.execute(stmt).all())]
+
+        for label, statement, parameters in checks:
+            plan, scanned = full_scans(statement, parameters)
+            failures += bool(scanned)
+            summary = f"full scan of {', '.join(scanned)}" if scanned else 'indexed'
+            print(f"{'FAIL' if scanned else 'OK  '} {label}: {summary}")
+            if scanned or verbose:
+                print('       ' + ' '.join(statement.split())[:300])
+                for line in plan:
+                    print(f"         {line}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Download the pinned third-party browser libraries so the app never needs a
+CDN at runtime (offline / NAS deployments). Every file is checked against the
+SHA-256 digest pinned in scripts/vendor.sha256 before it is written; a file
+without a pinned digest is not installed.
+
+    python scripts/fetch_vendor.py                     # into src/static/vendor, skip files already present
+    python scripts/fetch_vendor.py --force             # re-download
+    python scripts/fetch_vendor.py --dest /opt/vendor --offline-ok  # the Docker build (VENDOR_DIR)
+    python scripts/fetch_vendor.py --pin               # record the digests of what the CDN serves now
+
+The Docker build fetches into VENDOR_DIR because compose mounts the source
+over /app, which would hide files fetched into src/static/vendor. `--pin` is
+a one-off for a maintainer bumping a version: review the files, then commit
+scripts/vendor.sha256.
+"""
+import sys
+import os
+import hashlib
+import argparse
+import urllib.error
+import urllib.request
+
+# Add project root to path so imports work
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.static_assets import VENDOR_SCRIPTS
+
+STATIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'static', 'vendor'))
+PIN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendor.sha256')
+
+# Chart.js is ~200 KB; anything this big is not the file we asked for
+MAX_BYTES = 2 * 1024 * 1024
+
+
+def read_pins():
+    """filename -> pinned SHA-256 hex digest (sha256sum format, '#' comments)."""
+    pins = {}
+    with open(PIN_FILE) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                digest, filename = line.split(None, 1)
+                pins[filename.lstrip('*')] = digest.lower()
+    return pins
+
+
+def write_pins(pins):
+    with open(PIN_FILE) as f:
+        header = [line for line in f if line.startswith('#')]
+    with open(PIN_FILE, 'w') as f:
+        f.writelines(header)
+        for filename, digest in sorted(pins.items()):
+            f.write(f"{digest}  {filename}\n")
+
+
+def download(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        data = response.read(MAX_BYTES + 1)
+        expected = response.headers.get('Content-Length')
+    if len(data) > MAX_BYTES:
+        raise ValueError(f"more than {MAX_BYTES} bytes")
+    if expected is not None and int(expected) != len(data):
+        raise ValueError(f"truncated: {len(data)} of {expected} bytes")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the pinned vendor scripts.")
+    parser.add_argument('--dest', default=STATIC_DIR, help="target directory (default: src/static/vendor)")
+    parser.add_argument('--force', action='store_true', help="re-download files already present")
+    parser.add_argument('--pin', action='store_true', help="record the downloaded files' digests in vendor.sha256")
+    parser.add_argument('--offline-ok', action='store_true',
+                        help="skip files the CDN can't be reached for instead of failing (digest mismatches still fail)")
+    args = parser.parse_args()
+
+    pins = read_pins()
+    failed = unpinned = unreachable = 0
+    for name, (filename, url) in VENDOR_SCRIPTS.items():
+        target = os.path.join(args.dest, filename)
+        if os.path.exists(target) and not args.force and not args.pin:
+            print(f"    {name:<26} already present")
+            continue
+        try:
+            data = download(url)
+        except OSError as e:
+            # An HTTP error status is an answer, not a missing network
+            if not args.offline_ok or isinstance(e, urllib.error.HTTPError):
+                print(f"❌  {name:<26} {url}: {e}")
+                failed += 1
+            else:
+                print(f"⚠️  {name:<26} {url} unreachable ({e}), skipped; the app falls back to the CDN")
+                unreachable += 1
+            continue
+        except ValueError as e:
+            print(f"❌  {name:<26} {url}: {e}")
+            failed += 1
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if args.pin:
+            pins[filename] = digest
+        elif filename not in pins:
+            print(f"⚠️  {name:<26} no pinned digest in {os.path.basename(PIN_FILE)}, not installed (see --pin)")
+            unpinned += 1
+            continue
+        elif pins[filename] != digest:
+            print(f"❌  {name:<26} SHA-256 mismatch: got {digest}, pinned {pins[filename]}")
+            failed += 1
+            continue
+        os.makedirs(args.dest, exist_ok=True)
+        with open(target + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(target + '.tmp', target)
+        print(f"    {name:<26} {len(data):>8} bytes  sha256 {digest[:12]}…  <- {url}")
+
+    if args.pin:
+        write_pins(pins)
+        print(f"📌 Digests recorded in {PIN_FILE}; review and commit it")
+    if failed:
+        sys.exit(f"{failed} vendor file(s) failed download or verification")
+    if not unpinned and not unreachable:
+        print(f"✅ Vendor libraries in {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Deterministic synthetic estate generator for load and performance testing.
+
+    python scripts/generate_estate.py --assets 2000 --appraisals 24
+    python scripts/generate_estate.py --preset large --seed 7
+
+WIPES the configured database first. Everything is written with bulk
+(executemany) inserts, so even large estates generate in seconds.
+"""
+import sys
+import os
+import random
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+# Add project root to path so imports work
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert
+from src.extensions import db
+from src.models import (
+    Person, Asset, Appraisal, PropertyStructure, LocationPoint, RecurringBill,
+    AssetVendor, Task, Milestone, TrustProfile, asset_beneficiaries
+)
+
+DEFAULT_COUNTS = {
+    'people': 40,
+    'assets': 200,
+    'appraisals': 12,   # per asset
+    'bills': 300,
+    'structures': 150,
+    'pins': 400,
+    'vendors': 250,     # asset <-> contact service links
+    'tasks': 200,
+}
+
+PRESETS = {
+    'small': dict(DEFAULT_COUNTS, people=10, assets=25, appraisals=6, bills=30, structures=15, pins=40, vendors=25, tasks=20),
+    'medium': DEFAULT_COUNTS,
+    'large': dict(DEFAULT_COUNTS, people=300, assets=2000, appraisals=24, bills=3000, structures=1500, pins=4000, vendors=2500, tasks=2000),
+}
+
+FAMILY_ROLES = ['Trustor', 'Trustee', 'Beneficiary', 'Executor']
+PRO_ROLES = ['Attorney', 'Financial Advisor', 'Accountant', 'Insurance', 'Medical', 'Vendor', 'Vendor', 'Vendor']
+ASSET_TYPES = ['RealEstate', 'Bank', 'Investment', 'Vehicle', 'Jewelry', 'Art', 'Other', 'Liability']
+BILL_NAMES = [('Property Tax', 'County Treasurer', 'Annual'), ('Water', 'Metro Water Dept', 'Monthly'),
+              ('Electric', 'Power & Light', 'Monthly'), ('Insurance', 'Home Mutual', 'Annual'),
+              ('HOA Dues', 'Lakeside HOA', 'Quarterly')]
+STRUCTURES = [('Garden Shed', 'Outbuilding'), ('Deck', 'Deck'), ('Pool', 'Pool'), ('Garage', 'Garage'), ('Fence', 'Fence')]
+PINS = ['Water Shutoff', 'Septic Tank Lid', 'Gas Meter', 'Sprinkler Valve', 'Property Corner', 'Spare Key']
+
+
+def _attributes(rng, asset_type, purchase_date, purchase_price):
+    if asset_type == 'RealEstate':
+        return {'address': f"{rng.randint(1, 9999)} Synthetic Ave", 'apn_number': f"{rng.randint(100, 999)}-{rng.randint(10, 99)}",
+                'purchase_date': purchase_date.isoformat(), 'purchase_price': purchase_price}
+    if asset_type == 'Vehicle':
+        return {'vin': ''.join(rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ0123456789') for _ in range(17)),
+                'license_plate': f"SYN-{rng.randint(100, 999)}",
+                'purchase_date': purchase_date.isoformat(), 'purchase_price': purchase_price}
+    if asset_type in ('Bank', 'Investment'):
+        return {'institution': rng.choice(['Chase', 'Vanguard', 'Fidelity', 'Local Credit Union']),
+                'account_type': rng.choice(['Checking', 'Savings', 'CD']),
+                'account_number': f"XXXX-{rng.randint(1000, 9999)}"}
+    if asset_type == 'Liability':
+        return {'lender': rng.choice(['Wells Fargo', 'QuickCash Corp']), 'interest_rate': f"{rng.randint(2, 9)}.5%"}
+    return {'location': rng.choice(['Master Safe', 'Living Room', 'Storage Unit']), 'description': 'Synthetic item'}
+
+
+def generate_estate(counts=None, seed=42):
+    """
+    Replace the database contents with a synthetic estate. Requires an app context.
+    Returns {table: row_count}.
+    """
+    counts = dict(DEFAULT_COUNTS, **(counts or {}))
+    rng = random.Random(seed)
+    today = date.today()
+
+    db.drop_all()
+    db.create_all()
+
+    people = []
+    for i in range(1, counts['people'] + 1):
+        role = FAMILY_ROLES[i % len(FAMILY_ROLES)] if i % 3 else PRO_ROLES[i % len(PRO_ROLES)]
+        people.append({'id': i, 'name': f"Person {i:05d}", 'role': role, 'email': f"person{i}@example.com",
+                       'phone': f"555-{i % 10000:04d}", 'attributes': {'notes': f"Synthetic contact {i}"}})
+    family_ids = [p['id'] for p in people if p['role'] in FAMILY_ROLES] or [None]
+    vendor_ids = [p['id'] for p in people if p['role'] not in FAMILY_ROLES] or family_ids
+
+    assets, appraisals, beneficiaries = [], [], []
+    appraisal_id = 0
+    for i in range(1, counts['assets'] + 1):
+        asset_type = ASSET_TYPES[i % len(ASSET_TYPES)]
+        sign = -1 if asset_type == 'Liability' else 1
+        purchase_date = today - timedelta(days=rng.randint(365, 365 * 25))
+        value = round(rng.uniform(1_000, 900_000), 2)
+
+        # Random walk from purchase to today; the last appraisal is the current value
+        n = max(counts['appraisals'], 1)
+        span = (today - purchase_date).days
+        for k in range(n):
+            appraisal_id += 1
+            value = round(max(value * rng.uniform(0.9, 1.12), 100.0), 2)
+            appraisals.append({'id': appraisal_id, 'asset_id': i,
+                               'date': purchase_date + timedelta(days=span * k // max(n - 1, 1)),
+                               'value': sign * value, 'source': 'Purchase' if k == 0 else rng.choice(['Zillow', 'Statement', 'KBB', 'Appraiser'])})
+
+        assets.append({'id': i, 'name': f"{asset_type} {i:05d}", 'asset_type': asset_type,
+                       'is_in_trust': rng.random() < 0.7, 'owner_id': rng.choice(family_ids + [None]),
+                       'value_estimated': sign * value,
+                       'attributes': _attributes(rng, asset_type, purchase_date, appraisals[-n]['value'])})
+        for person_id in set(rng.sample(family_ids, min(2, len(family_ids)))) - {None}:
+            beneficiaries.append({'asset_id': i, 'person_id': person_id, 'percentage': 50.0})
+
+    asset_ids = [a['id'] for a in assets] or [None]
+    property_ids = [a['id'] for a in assets if a['asset_type'] == 'RealEstate'] or asset_ids
+
+    bills = []
+    for i in range(1, counts['bills'] + 1):
+        name, payee, frequency = rng.choice(BILL_NAMES)
+        bills.append({'id': i, 'asset_id': rng.choice(property_ids), 'name': name, 'payee': payee,
+                      'account_number': f"{rng.randint(1000, 9999)}-{rng.randint(100, 999)}",
+                      'amount_estimated': round(rng.uniform(30, 8000), 2), 'frequency': frequency,
+                      'is_autopay': rng.random() < 0.5, 'next_due_date': today + timedelta(days=rng.randint(-30, 365)),
+                      'notes': None})
+
+    structures = []
+    for i in range(1, counts['structures'] + 1):
+        name, structure_type = rng.choice(STRUCTURES)
+        structures.append({'id': i, 'asset_id': rng.choice(property_ids), 'name': name, 'structure_type': structure_type,
+                           'description': f"Synthetic {structure_type.lower()}", 'date_built': None,
+                           'date_last_maintained': today - timedelta(days=rng.randint(0, 3000)),
+                           'notes': rng.choice([None, 'Painted', 'Roof patched', 'Serviced'])})
+
+    pins = [{'id': i, 'asset_id': rng.choice(property_ids), 'label': rng.choice(PINS),
+             'latitude': round(rng.uniform(32.5, 33.0), 6), 'longitude': round(rng.uniform(-117.3, -116.9), 6),
+             'description': f"Marker {i}, near the {rng.choice(['fake rock', 'oak tree', 'north fence', 'driveway'])}"}
+            for i in range(1, counts['pins'] + 1)]
+
+    vendors = [{'id': i, 'asset_id': rng.choice(asset_ids), 'person_id': rng.choice(vendor_ids),
+                'role': rng.choice(['Gardener', 'Pool Cleaner', 'Plumber', 'Electrician']),
+                'notes': f"Gate code {rng.randint(1000, 9999)}"}
+               for i in range(1, counts['vendors'] + 1)]
+
+    tasks = [{'id': i, 'title': f"Task {i:05d}", 'status': rng.choice(['Pending', 'Done']),
+              'due_date': datetime.combine(today + timedelta(days=rng.randint(-700, 700)), datetime.min.time()),
+              'is_recurring': rng.random() < 0.2, 'asset_id': rng.choice(asset_ids + [None])}
+             for i in range(1, counts['tasks'] + 1)]
+
+    milestones = [{'id': 1, 'title': 'Trust Established', 'date_event': datetime(2010, 1, 1), 'description': 'Synthetic', 'is_completed': True},
+                  {'id': 2, 'title': 'Annual Review', 'date_event': datetime.combine(today + timedelta(days=90), datetime.min.time()),
+                   'description': 'Synthetic', 'is_completed': False}]
+
+    tables = [
+        (TrustProfile.__table__, [{'id': 1, 'name': 'The Synthetic Trust', 'date_established': date(2010, 1, 1),
+                                   'review_frequency': 'Annual', 'next_review_date': today + timedelta(days=90)}]),
+        (Person.__table__, people),
+        (Asset.__table__, assets),
+        (asset_beneficiaries, beneficiaries),
+        (Appraisal.__table__, appraisals),
+        (RecurringBill.__table__, bills),
+        (PropertyStructure.__table__, structures),
+        (LocationPoint.__table__, pins),
+        (AssetVendor.__table__, vendors),
+        (Task.__table__, tasks),
+        (Milestone.__table__, milestones),
+    ]
+    for table, rows in tables:
+        if rows:
+            db.session.execute(insert(table), rows)
+    # Cached valuations and the chart series are filled by the appraisal write hooks
+    db.session.commit()
+
+    return {table.name: len(rows) for table, rows in tables}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='medium')
+    parser.add_argument('--seed', type=int, default=42)
+    for key in DEFAULT_COUNTS:
+        parser.add_argument(f'--{key}', type=int, default=None)
+    args = parser.parse_args()
+
+    counts = dict(PRESETS[args.preset])
+    counts.update({k: getattr(args, k) for k in DEFAULT_COUNTS if getattr(args, k) is not None})
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        print(f"--- [SYNTHETIC] Wiping & generating ({args.preset}, seed={args.seed}) ---")
+        started = time.perf_counter()
+        written = generate_estate(counts, seed=args.seed)
+        for table, count in written.items():
+            print(f"    {table:<22} {count:>8}")
+        print(f"✅ Synthetic estate generated in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
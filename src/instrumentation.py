@@ -0,0 +1,107 @@
+import time
+import threading
+from collections import deque
+from flask import g, request, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+from src.extensions import db
+
+# Opt-in request profiling (PERF_INSTRUMENTATION=1):
+#   - counts SQL statements and sums their time per request
+#   - measures template rendering
+#   - emits both as a Server-Timing header (visible in the browser dev tools)
+#   - logs statements slower than PERF_SLOW_QUERY_MS
+#   - keeps a rolling window of samples per endpoint for /settings/performance
+# Samples live in the worker process, so each gunicorn worker has its own window.
+
+_lock = threading.Lock()
+_samples = {}
+
+
+def init_instrumentation(app):
+    if not app.config.get('PERF_INSTRUMENTATION'):
+        return
+
+    slow_ms = app.config['PERF_SLOW_QUERY_MS']
+    window = app.config['PERF_WINDOW']
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _query_start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('perf_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _query_end(conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - conn.info['perf_query_start'].pop()) * 1000
+        if elapsed > slow_ms:
+            app.logger.warning("Slow query (%.1fms): %s", elapsed, ' '.join(statement.split())[:500])
+        if has_request_context() and 'perf' in g:
+            g.perf['queries'] += 1
+            g.perf['db_ms'] += elapsed
+
+    @before_render_template.connect_via(app)
+    def _render_start(sender, template, context, **extra):
+        if 'perf' in g:
+            g.perf['render_started'] = time.perf_counter()
+
+    @template_rendered.connect_via(app)
+    def _render_end(sender, template, context, **extra):
+        if 'perf' in g and g.perf.get('render_started'):
+            g.perf['render_ms'] += (time.perf_counter() - g.perf.pop('render_started')) * 1000
+
+    @app.before_request
+    def _request_start():
+        g.perf = {'started': time.perf_counter(), 'queries': 0, 'db_ms': 0.0, 'render_ms': 0.0}
+
+    @app.after_request
+    def _request_end(response):
+        perf = g.pop('perf', None)
+        if perf is None:
+            return response
+        total_ms = (time.perf_counter() - perf['started']) * 1000
+        response.headers.add('Server-Timing', ', '.join([
+            f'db;dur={perf["db_ms"]:.1f};desc="{perf["queries"]} queries"',
+            f'tpl;dur={perf["render_ms"]:.1f};desc="templates"',
+            f'app;dur={total_ms:.1f};desc="total"',
+        ]))
+
+        if request.endpoint and request.endpoint not in ('static', 'vendor_static'):
+            with _lock:
+                bucket = _samples.setdefault(request.endpoint, deque(maxlen=window))
+                bucket.append((total_ms, perf['queries'], perf['db_ms'], perf['render_ms']))
+        return response
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def get_endpoint_summary():
+    """Per-endpoint aggregates of the rolling window, slowest (p95) first."""
+    with _lock:
+        snapshot = {endpoint: list(bucket) for endpoint, bucket in _samples.items()}
+
+    rows = []
+    for endpoint, samples in snapshot.items():
+        totals = [s[0] for s in samples]
+        queries = [s[1] for s in samples]
+        rows.append({
+            'endpoint': endpoint,
+            'count': len(samples),
+            'avg_ms': sum(totals) / len(samples),
+            'p95_ms': _percentile(totals, 95),
+            'max_ms': max(totals),
+            'avg_queries': sum(queries) / len(samples),
+            'max_queries': max(queries),
+            'avg_db_ms': sum(s[2] for s in samples) / len(samples),
+            'avg_render_ms': sum(s[3] for s in samples) / len(samples),
+        })
+    rows.sort(key=lambda r: r['p95_ms'], reverse=True)
+    return rows
+
+
+def reset_samples():
+    with _lock:
+        _samples.clear()
@@ -5,13 +5,14 @@ from src.extensions import db
 asset_beneficiaries = db.Table('asset_beneficiaries',
     db.Column('asset_id', db.Integer, db.ForeignKey('asset.id'), primary_key=True),
     db.Column('person_id', db.Integer, db.ForeignKey('person.id'), primary_key=True),
-    db.Column('percentage', db.Float, default=50.0)
+    db.Column('percentage', db.Float, default=50.0),
+    db.Index('ix_asset_beneficiaries_person_id', 'person_id')
 )
 
 class Person(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    role = db.Column(db.String(50)) 
+    name = db.Column(db.String(100), nullable=False, index=True)
+    role = db.Column(db.String(50), index=True)
     email = db.Column(db.String(120))
     phone = db.Column(db.String(20))
     attributes = db.Column(db.JSON, default={})
@@ -21,19 +22,53 @@ class Person(db.Model):
     # New: Service links (Vendors)
     service_jobs = db.relationship('AssetVendor', backref='provider', lazy=True)
 
+# --- JSON attribute expressions (generated columns) ---
+def _attr_text(key):
+    return f"NULLIF(trim(json_extract(attributes, '$.{key}')), '')"
+
+def _attr_date(key):
+    raw = f"json_extract(attributes, '$.{key}')"
+    return f"CASE WHEN date({raw}) = {raw} THEN {raw} END"
+
+def _attr_number(key):
+    return (f"CASE WHEN json_type(attributes, '$.{key}') IN ('integer', 'real') "
+            f"THEN json_extract(attributes, '$.{key}') END")
+
 class Asset(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(150), nullable=False)
+    name = db.Column(db.String(150), nullable=False, index=True)
     asset_type = db.Column(db.String(50))
     
-    is_in_trust = db.Column(db.Boolean, default=True)
-    owner_id = db.Column(db.Integer, db.ForeignKey('person.id'), nullable=True)
+    is_in_trust = db.Column(db.Boolean, default=True, index=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey('person.id'), nullable=True, index=True)
     
-    value_estimated = db.Column(db.Float, default=0.0)
+    value_estimated = db.Column(db.Float, default=0.0, index=True)
     attributes = db.Column(db.JSON, default={})
+
+    # Cached from the appraisal log by valuation_service on every appraisal write
+    latest_valuation_date = db.Column(db.Date, nullable=True, index=True)
+    valuation_count = db.Column(db.Integer, default=0)
+
+    # Hot attribute keys, exposed as indexed generated columns (SQLite, VIRTUAL:
+    # computed from `attributes` on read, never written directly). Values that
+    # are not a strict YYYY-MM-DD date / a JSON number read as NULL.
+    purchase_date = db.Column(db.Date, db.Computed(_attr_date('purchase_date'), persisted=False), index=True)
+    purchase_price = db.Column(db.Float, db.Computed(_attr_number('purchase_price'), persisted=False), index=True)
+    institution = db.Column(db.String(150), db.Computed(_attr_text('institution'), persisted=False), index=True)
+    account_type = db.Column(db.String(50), db.Computed(_attr_text('account_type'), persisted=False), index=True)
+    vin = db.Column(db.String(50), db.Computed(_attr_text('vin'), persisted=False), index=True)
+    address = db.Column(db.String(255), db.Computed(_attr_text('address'), persisted=False), index=True)
+
+    # Sort keys of the assets page (see services/asset_list_service.py); the
+    # composite serves the common "one type, by value" listing and, as its
+    # leading column, every other asset_type lookup
+    __table_args__ = (
+        db.Index('ix_asset_type_value', 'asset_type', 'value_estimated'),
+    )
     
     # Relationships
-    beneficiaries = db.relationship('Person', secondary=asset_beneficiaries, lazy='subquery',
+    # Loaded lazily; views that need it opt in via a loading profile (see routes/main.py)
+    beneficiaries = db.relationship('Person', secondary=asset_beneficiaries, lazy=True,
         backref=db.backref('future_assets', lazy=True))
     
     appraisals = db.relationship('Appraisal', backref='asset', lazy=True, cascade="all, delete-orphan", order_by="desc(Appraisal.date)")
@@ -52,18 +87,35 @@ class Appraisal(db.Model):
     source = db.Column(db.String(100)) # e.g. "Zillow", "Official Appraiser", "KBB"
     notes = db.Column(db.Text)
 
+    __table_args__ = (
+        db.Index('ix_appraisal_asset_date', 'asset_id', 'date'),
+        db.Index('ix_appraisal_date', 'date'),
+    )
+
+class ValuationPoint(db.Model):
+    """Precomputed valuation series. One row per asset per valuation date;
+    rows with asset_id NULL hold the estate-wide net worth series."""
+    id = db.Column(db.Integer, primary_key=True)
+    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=True)
+    date = db.Column(db.Date, nullable=False)
+    value = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_valuation_point_asset_date', 'asset_id', 'date'),
+    )
+
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     status = db.Column(db.String(20), default='Pending') 
-    due_date = db.Column(db.DateTime, nullable=True)
+    due_date = db.Column(db.DateTime, nullable=True, index=True)
     is_recurring = db.Column(db.Boolean, default=False)
     asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=True)
 
 class Milestone(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
-    date_event = db.Column(db.DateTime, nullable=True)
+    date_event = db.Column(db.DateTime, nullable=True, index=True)
     description = db.Column(db.Text)
     is_completed = db.Column(db.Boolean, default=False)
 
@@ -72,18 +124,18 @@ class Milestone(db.Model):
 class PropertyStructure(db.Model):
     """Accommodations: Sheds, Pools, Decks, Garages."""
     id = db.Column(db.Integer, primary_key=True)
-    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
+    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)     # e.g. "North Garden Shed"
     structure_type = db.Column(db.String(50))            # e.g. "Outbuilding", "Deck", "Pool"
     description = db.Column(db.Text)
     date_built = db.Column(db.Date, nullable=True)
-    date_last_maintained = db.Column(db.Date, nullable=True) # "When was this last painted/serviced?"
+    date_last_maintained = db.Column(db.Date, nullable=True, index=True) # "When was this last painted/serviced?"
     notes = db.Column(db.Text)
 
 class LocationPoint(db.Model):
     """Coordinate Ledger for specific items on a property."""
     id = db.Column(db.Integer, primary_key=True)
-    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
+    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False, index=True)
     label = db.Column(db.String(100), nullable=False)    # e.g. "Septic Tank Lid"
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
@@ -92,21 +144,21 @@ class LocationPoint(db.Model):
 class RecurringBill(db.Model):
     """Holding costs associated with an asset."""
     id = db.Column(db.Integer, primary_key=True)
-    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
+    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)     # e.g. "County Property Tax"
     payee = db.Column(db.String(100))                    # e.g. "San Diego Treasurer"
     account_number = db.Column(db.String(100))           # NEW: Migrated from Utility
     amount_estimated = db.Column(db.Float, default=0.0)
     frequency = db.Column(db.String(50))                 # e.g. "Annual", "Monthly"
     is_autopay = db.Column(db.Boolean, default=False)
-    next_due_date = db.Column(db.Date, nullable=True)
+    next_due_date = db.Column(db.Date, nullable=True, index=True)
     notes = db.Column(db.Text)
 
 class AssetVendor(db.Model):
     """Link a Person/Contact to a specific Asset with a Role."""
     id = db.Column(db.Integer, primary_key=True)
-    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
-    person_id = db.Column(db.Integer, db.ForeignKey('person.id'), nullable=False)
+    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False, index=True)
+    person_id = db.Column(db.Integer, db.ForeignKey('person.id'), nullable=False, index=True)
     role = db.Column(db.String(100), nullable=False)     # e.g. "Pool Cleaner", "Landscaper" (Specific to this asset)
     notes = db.Column(db.Text)
 
@@ -125,4 +177,22 @@ class TrustProfile(db.Model):
     # Administrative
     review_frequency = db.Column(db.String(50), default="Annual")
     next_review_date = db.Column(db.Date, nullable=True)
-    notes = db.Column(db.Text)
\ No newline at end of file
+    notes = db.Column(db.Text)
+
+# --- CHANGE TRACKING (incremental backups) ---
+
+class ChangeLog(db.Model):
+    """Append-only log of the rows written in every backed-up table, one entry
+    per write, filled by SQLite triggers (see services/changelog_service.py).
+    seq only grows; a backup's id is the highest seq it includes."""
+    __tablename__ = 'change_log'
+    seq = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    row_id2 = db.Column(db.Integer, nullable=False, default=0)  # second key column of association rows
+
+    __table_args__ = (
+        db.Index('ix_change_log_table_seq', 'table_name', 'seq'),
+        db.Index('ix_change_log_row', 'table_name', 'row_id', 'row_id2'),
+        {'sqlite_autoincrement': True},
+    )
@@ -0,0 +1,153 @@
+import os
+import time
+import uuid
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from datetime import date
+from flask import current_app, request, session, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.compression import GZIP_ETAG_SUFFIX
+
+# Read-only pages are cached per worker process, keyed by a global data version.
+#   - Any committed write bumps the version (session after_commit hook).
+#   - The version lives in a small file in the instance folder so a write in one
+#     gunicorn worker invalidates the other worker's cache too.
+#   - The ETag is derived from the cache key, not the body, so a matching
+#     If-None-Match is answered with 304 before any query runs.
+# Pages also depend on today's date (history/upcoming split), which is part of the key.
+
+_VERSION_FILE = 'data_version'
+_CHANGED = 'data_changed'
+
+
+def _version_path(app):
+    return os.path.join(app.instance_path, _VERSION_FILE)
+
+
+def bump_data_version(app=None):
+    """Mark all cached pages stale (in every worker). Unique token, so concurrent bumps can't collide."""
+    path = _version_path(app or current_app)
+    token = f'{time.time_ns()}-{uuid.uuid4().hex}'
+    # Per-call temp file: threads of one worker must not share it
+    tmp = f'{path}.{token}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(token)
+    os.replace(tmp, path)
+
+
+def get_data_version(app=None):
+    app = app or current_app
+    try:
+        with open(_version_path(app)) as f:
+            return f.read()
+    except FileNotFoundError:
+        bump_data_version(app)
+        return get_data_version(app)
+
+
+class PageCache:
+    """Small thread-safe LRU of rendered pages."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# --- WRITE TRACKING ---
+
+def _flag_flush(session, flush_context):
+    session.info[_CHANGED] = True
+
+
+def _flag_bulk_write(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_CHANGED] = True
+
+
+def _bump_on_commit(session):
+    if session.info.pop(_CHANGED, False):
+        bump_data_version()
+
+
+def _forget_on_rollback(session):
+    session.info.pop(_CHANGED, None)
+
+
+_HOOKS = [
+    ('after_flush', _flag_flush),
+    ('do_orm_execute', _flag_bulk_write),
+    ('after_commit', _bump_on_commit),
+    ('after_rollback', _forget_on_rollback),
+]
+
+
+def init_page_cache(app):
+    app.extensions['page_cache'] = PageCache(app.config['PAGE_CACHE_SIZE'])
+    # A (re)start may ship new templates and asset fingerprints: retire every
+    # ETag browsers hold, or they'd keep getting 304s for the old HTML
+    if app.config['PAGE_CACHE_ENABLED']:
+        bump_data_version(app)
+    for name, fn in _HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+def cached_page(view):
+    """
+    Serve a read-only view from the page cache, with a strong ETag and 304s.
+    Place below @login_required. Requests with pending flash messages bypass
+    the cache (the rendered page would contain them).
+    """
+    @functools.wraps(view)
+    def wrapped_view(**kwargs):
+        cache = current_app.extensions.get('page_cache')
+        if not current_app.config['PAGE_CACHE_ENABLED'] or cache is None or '_flashes' in session:
+            return view(**kwargs)
+
+        args = tuple(sorted((k, tuple(v)) for k, v in request.args.lists()))
+        key = (request.endpoint, tuple(sorted(kwargs.items())), args, get_data_version(), date.today().isoformat())
+        etag = hashlib.sha1(repr(key).encode()).hexdigest()
+
+        # The client may hold the gzipped representation's tag (see src/compression.py)
+        matched = next((tag for tag in (etag, etag + GZIP_ETAG_SUFFIX) if tag in request.if_none_match), None)
+        if matched:
+            response = make_response('', 304)
+            response.set_etag(matched)
+        else:
+            entry = cache.get(key)
+            if entry is None:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = (response.get_data(), response.mimetype)
+                cache.put(key, entry)
+            response = make_response(entry[0])
+            response.mimetype = entry[1]
+            response.set_etag(etag)
+
+        # Always revalidate; the ETag makes that a cheap 304
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapped_view
@@ -0,0 +1,105 @@
+from datetime import date
+import numpy as np
+from sqlalchemy import select
+from flask import Blueprint, request, jsonify
+from src.services.auth_service import login_required
+from src.page_cache import cached_page
+from src.services.valuation_service import get_bucketed_series
+from src.services import series_service as series
+from src.models import Asset
+from src.extensions import db
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+# Read-only JSON for charts and external tools. Every series endpoint takes
+#   from, to     ISO dates (default: first valuation .. today)
+#   resolution   day | week | month | quarter | year (default: month)
+# and returns one forward-filled value per bucket, sampled at the bucket's
+# last day (the final bucket ends at `to`).
+
+MAX_BUCKETS = 5000
+
+
+class RangeError(ValueError):
+    pass
+
+
+def _range_args():
+    """Parse from/to/resolution. Raises RangeError with a message for the client."""
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+    except ValueError:
+        raise RangeError("'from' and 'to' must be ISO dates (YYYY-MM-DD)")
+    if start and start > end:
+        raise RangeError("'from' must not be after 'to'")
+
+    resolution = request.args.get('resolution', 'month')
+    if resolution not in series.RESOLUTIONS:
+        raise RangeError(f"'resolution' must be one of: {', '.join(series.RESOLUTIONS)}")
+
+    if start:
+        _check_size(series.bucket_ends(start, end, resolution))
+    return start, end, resolution
+
+
+def _check_size(axis):
+    if len(axis) > MAX_BUCKETS:
+        raise RangeError(f"More than {MAX_BUCKETS} buckets; use a coarser resolution")
+
+
+def _range_payload(start, end, resolution, axis):
+    return {
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'resolution': resolution,
+        'dates': series.iso_dates(axis),
+    }
+
+
+@bp.errorhandler(RangeError)
+def _bad_range(error):
+    return jsonify({'error': str(error)}), 400
+
+
+@bp.route('/networth')
+@login_required
+@cached_page
+def networth():
+    start, end, resolution = _range_args()
+    start, axis, totals, asset_ids, matrix = get_bucketed_series(end, resolution, start)
+    _check_size(axis)
+
+    meta = {a.id: a for a in db.session.execute(select(Asset.id, Asset.name, Asset.asset_type))}
+
+    # Per asset type: one grouped sum over the asset rows
+    types = sorted({meta[a].asset_type or 'Other' for a in asset_ids})
+    type_index = np.array([types.index(meta[a].asset_type or 'Other') for a in asset_ids], dtype=int)
+    by_type = np.zeros((len(types), len(axis)))
+    np.add.at(by_type, type_index, matrix)
+
+    payload = _range_payload(start, end, resolution, axis)
+    payload.update({
+        'totals': totals.tolist(),
+        'by_type': dict(zip(types, by_type.tolist())),
+        'assets': [
+            {'id': a, 'name': meta[a].name, 'type': meta[a].asset_type, 'values': values}
+            for a, values in zip(asset_ids, matrix.tolist())
+        ],
+    })
+    return jsonify(payload)
+
+
+@bp.route('/asset/<int:id>/valuations')
+@login_required
+@cached_page
+def asset_valuations(id):
+    asset = db.get_or_404(Asset, id)
+    start, end, resolution = _range_args()
+    start, axis, _, asset_ids, matrix = get_bucketed_series(end, resolution, start, asset_id=id)
+    _check_size(axis)
+
+    payload = {'id': asset.id, 'name': asset.name, 'type': asset.asset_type}
+    payload.update(_range_payload(start, end, resolution, axis))
+    payload['values'] = matrix[0].tolist() if asset_ids else [0.0] * len(axis)
+    return jsonify(payload)
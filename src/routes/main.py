@@ -1,9 +1,20 @@
-import json
 from datetime import date, datetime
-from flask import Blueprint, render_template, request, redirect, url_for
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from flask import Blueprint, render_template, request, redirect, url_for, current_app, jsonify, abort
 from src.services.auth_service import login_required
-from src.services.timeline_service import get_timeline_events
-from src.models import Person, Asset, Milestone, Task, Appraisal, TrustProfile
+from src.page_cache import cached_page
+from src.services.timeline_service import get_timeline_page
+from src.services.valuation_service import get_series
+from src.services.summary_service import get_estate_summary
+from src.services.search_service import search
+from src.services.forecast_service import get_forecast, MIN_MONTHS
+from src.services.asset_list_service import get_asset_page, get_filter_choices, SORT_KEYS, DEFAULT_SORT
+from src.services.contacts_service import get_family, get_professionals_page, get_professional_roles
+from src.services import series_service as series
+from src.models import (Asset, AssetVendor, Milestone, Task, Appraisal, TrustProfile,
+                        PropertyStructure, LocationPoint, RecurringBill)
 from src.forms import AppraisalForm
 from src.extensions import db
 
@@ -21,189 +32,322 @@ ASSET_ICONS = {
     'Other': '📦'
 }
 
-@bp.route('/')
-@login_required
-def dashboard():
-    all_assets = Asset.query.all()
-    total_assets = sum(a.value_estimated for a in all_assets if a.value_estimated > 0)
-    total_liabilities = sum(a.value_estimated for a in all_assets if a.value_estimated < 0)
-    net_worth = total_assets + total_liabilities
-    trust_count = sum(1 for a in all_assets if a.is_in_trust)
-    
-    # --- CHART DATA PREPARATION ---
-    all_dates = set()
-    for asset in all_assets:
-        for app in asset.appraisals:
-            all_dates.add(app.date)
-    
-    all_dates.add(date.today())
-    sorted_dates = sorted(list(all_dates))
-    
-    datasets = []
-    
-    asset_colors = [
-        '#16a34a', '#2563eb', '#9333ea', '#0891b2', '#0d9488', 
-        '#4f46e5', '#059669', '#7c3aed', '#0284c7', '#65a30d'
-    ]
-    
-    liability_colors = [
-        '#dc2626', '#ea580c', '#db2777', '#b91c1c', '#c2410c',
-        '#be123c', '#991b1b', '#9a3412', '#831843', '#7f1d1d'
-    ]
-    
+# --- LOADING PROFILES ---
+# Each view loads exactly the relationships its template walks, in a fixed
+# number of queries, and raises on anything else so new N+1s show up in dev.
+# (The dashboard only selects columns and needs none.)
+# Functions rather than constants: backref attributes such as Asset.owner
+# only exist once the mappers are configured.
+def asset_list_profile():
+    return (
+        joinedload(Asset.owner),
+        raiseload('*'),
+    )
+
+def asset_detail_profile():
+    # Only the overview is rendered with the page; other tabs come from asset_tab
+    return (
+        joinedload(Asset.owner),
+        selectinload(Asset.appraisals),
+        raiseload('*'),
+    )
+
+ASSET_COLORS = [
+    '#16a34a', '#2563eb', '#9333ea', '#0891b2', '#0d9488',
+    '#4f46e5', '#059669', '#7c3aed', '#0284c7', '#65a30d'
+]
+
+LIABILITY_COLORS = [
+    '#dc2626', '#ea580c', '#db2777', '#b91c1c', '#c2410c',
+    '#be123c', '#991b1b', '#9a3412', '#831843', '#7f1d1d'
+]
+
+def _chart_assets():
+    """Per-asset chart metadata (label, colour, sign), in a stable order shared by page and data."""
+    rows = db.session.execute(
+        select(Asset.id, Asset.name, Asset.asset_type, Asset.value_estimated).order_by(Asset.id)
+    ).all()
+
+    chart_assets = []
     a_idx = 0
     l_idx = 0
-    
-    for asset in all_assets:
-        apps = sorted(asset.appraisals, key=lambda x: x.date)
-        app_map = {a.date: a.value for a in apps}
-        start_date = apps[0].date if apps else date.max
-        data_points = []
-        current_val = 0.0
-        for d in sorted_dates:
-            if d in app_map:
-                current_val = app_map[d]
-            elif d < start_date:
-                current_val = 0.0
-            data_points.append(current_val)
-        
+    for asset in rows:
         if asset.value_estimated < 0:
-            color = liability_colors[l_idx % len(liability_colors)]
+            color = LIABILITY_COLORS[l_idx % len(LIABILITY_COLORS)]
             l_idx += 1
         else:
-            color = asset_colors[a_idx % len(asset_colors)]
+            color = ASSET_COLORS[a_idx % len(ASSET_COLORS)]
             a_idx += 1
-            
-        datasets.append({
+
+        chart_assets.append({
             'id': asset.id,
             'label': asset.name,
-            'data': data_points,
             'color': color,
             'type': asset.asset_type,
             'current_value': asset.value_estimated
         })
-        
-    chart_payload = {
-        'dates': [d.isoformat() for d in sorted_dates],
-        'datasets': datasets
-    }
+    return chart_assets
+
+def _downsample(axis, values):
+    return series.downsample_indices(axis, values,
+                                     current_app.config['CHART_MAX_POINTS'],
+                                     current_app.config['CHART_DOWNSAMPLE'])
 
+@bp.route('/')
+@login_required
+@cached_page
+def dashboard():
+    summary = get_estate_summary()
+
+    # The chart series arrive separately from main.dashboard_chart, so the
+    # page renders without waiting on them.
     return render_template('dashboard.html', 
                            active_page='overview',
-                           net_worth=net_worth,
-                           total_assets=total_assets,
-                           total_liabilities=total_liabilities,
-                           trust_count=trust_count,
-                           chart_payload=chart_payload)
+                           net_worth=summary['net_worth'],
+                           total_assets=summary['total_assets'],
+                           total_liabilities=summary['total_liabilities'],
+                           trust_count=summary['trust_count'],
+                           allocation=summary['allocation'],
+                           asset_icons=ASSET_ICONS,
+                           chart_assets=_chart_assets())
+
+@bp.route('/chart.json')
+@login_required
+@cached_page
+def dashboard_chart():
+    datasets = _chart_assets()
+    # Series are precomputed by valuation_service on every appraisal write.
+    totals, series_by_asset = get_series()
+    axis = series.date_axis(totals, extra_dates=[date.today()])
+    total_values = series.forward_fill(axis, [totals])[0]
+    asset_matrix = series.forward_fill(axis, [series_by_asset.get(ds['id'], []) for ds in datasets])
+
+    # Only ship a shape-preserving subset of points for long histories
+    keep = _downsample(axis, total_values)
+    for ds, data_points in zip(datasets, asset_matrix[:, keep].tolist()):
+        ds['data'] = data_points
+
+    return jsonify({
+        'dates': series.iso_dates(axis[keep]),
+        'totals': total_values[keep].tolist(),
+        'datasets': datasets
+    })
+
+def _current_url(**overrides):
+    """Current page URL with some query args replaced (None removes the arg)."""
+    args = request.args.to_dict(flat=False)
+    for key, value in overrides.items():
+        if value is None:
+            args.pop(key, None)
+        else:
+            args[key] = value
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
 
 @bp.route('/assets')
 @login_required
+@cached_page
 def assets_view():
-    all_items = Asset.query.all()
-    
-    # Sort Assets: Highest Value First
-    assets_list = sorted(
-        [a for a in all_items if a.value_estimated >= 0],
-        key=lambda x: x.value_estimated,
-        reverse=True
-    )
-    
-    # Sort Liabilities: Most Negative (Largest Debt) First
-    liabilities_list = sorted(
-        [a for a in all_items if a.value_estimated < 0],
-        key=lambda x: x.value_estimated
+    sort = request.args.get('sort')
+    if sort not in SORT_KEYS:
+        sort = DEFAULT_SORT
+    order = request.args.get('order')
+    trust = request.args.get('trust')
+    listing = dict(
+        sort=sort,
+        descending={'asc': False, 'desc': True}.get(order),
+        page_size=current_app.config['ASSETS_PAGE_SIZE'],
+        asset_types=request.args.getlist('type') or None,
+        in_trust={'1': True, '0': False}.get(trust),
+        owner_id=request.args.get('owner', type=int),
+        options=asset_list_profile(),
     )
+
+    # Assets (highest value first by default) and liabilities (largest debt
+    # first) are separate keyset-paginated queries over the same filters
+    assets_list, assets_next = get_asset_page('assets', cursor=request.args.get('assets_after'), **listing)
+    liabilities_list, liabilities_next = get_asset_page('liabilities', cursor=request.args.get('liabilities_after'),
+                                                        **listing)
+    asset_types, owners = get_filter_choices()
     
     return render_template('assets.html', 
                            assets=assets_list, 
                            liabilities=liabilities_list, 
+                           assets_more_url=_current_url(assets_after=assets_next) if assets_next else None,
+                           liabilities_more_url=_current_url(liabilities_after=liabilities_next) if liabilities_next else None,
+                           assets_reset_url=_current_url(assets_after=None) if request.args.get('assets_after') else None,
+                           liabilities_reset_url=(_current_url(liabilities_after=None)
+                                                  if request.args.get('liabilities_after') else None),
+                           sort_keys=SORT_KEYS,
+                           current_sort=sort,
+                           current_order=order if order in ('asc', 'desc') else '',
+                           current_types=request.args.getlist('type'),
+                           current_trust=trust if trust in ('1', '0') else '',
+                           current_owner=listing['owner_id'],
+                           asset_types=asset_types,
+                           owners=owners,
                            active_page='assets',
                            asset_icons=ASSET_ICONS)
 
 @bp.route('/asset/<int:id>')
 @login_required
 def asset_details(id):
-    asset = Asset.query.get_or_404(id)
+    asset = Asset.query.options(*asset_detail_profile()).filter_by(id=id).first_or_404()
     form = AppraisalForm()
     
-    history = sorted(asset.appraisals, key=lambda x: x.date)
-    
-    if not history:
-        dates = [json.dumps(str(asset.attributes.get('purchase_date', 'Initial'))).strip('"')]
-        values = [asset.value_estimated]
-    else:
-        dates = [h.date.strftime('%Y-%m-%d') for h in history]
-        values = [h.value for h in history]
-    
     return render_template('asset_details.html', 
                            asset=asset, 
+                           appraisals=asset.appraisals,
                            form=form, 
-                           chart_dates=dates, 
-                           chart_values=values,
                            active_page='assets')
 
+# --- ASSET PAGE TABS ---
+# tab -> (fragment template, template variable, child model, loading profile, ordering)
+def asset_tabs():
+    return {
+        'history': ('asset_tab_history.html', 'appraisals', Appraisal, (), Appraisal.date.desc()),
+        'structures': ('asset_tab_structures.html', 'structures', PropertyStructure, (), PropertyStructure.id),
+        'pins': ('asset_tab_pins.html', 'pins', LocationPoint, (), LocationPoint.id),
+        'bills': ('asset_tab_bills.html', 'bills', RecurringBill, (), RecurringBill.id),
+        'vendors': ('asset_tab_vendors.html', 'vendors', AssetVendor, (joinedload(AssetVendor.provider),), AssetVendor.id),
+    }
+
+@bp.route('/asset/<int:id>/tab/<tab>')
+@login_required
+@cached_page
+def asset_tab(id, tab):
+    """One tab of the asset page as an HTML fragment: an existence check plus one query for its rows."""
+    tabs = asset_tabs()
+    if tab not in tabs:
+        abort(404)
+    if db.session.execute(select(Asset.id).where(Asset.id == id)).first() is None:
+        abort(404)
+    template, name, model, profile, order = tabs[tab]
+    rows = model.query.options(*profile, raiseload('*')).filter_by(asset_id=id).order_by(order).all()
+    return render_template(template, asset_id=id, **{name: rows})
+
+@bp.route('/asset/<int:id>/chart.json')
+@login_required
+@cached_page
+def asset_chart(id):
+    asset = db.session.execute(
+        select(Asset.purchase_date, Asset.value_estimated).where(Asset.id == id)
+    ).first()
+    if asset is None:
+        abort(404)
+    history = db.session.execute(
+        select(Appraisal.date, Appraisal.value)
+        .where(Appraisal.asset_id == id)
+        .order_by(Appraisal.date, Appraisal.id)
+    ).all()
+
+    if not history:
+        dates = [asset.purchase_date.isoformat() if asset.purchase_date else 'Initial']
+        values = [asset.value_estimated]
+    else:
+        axis = series.to_datetimes([h.date for h in history])
+        values = np.array([h.value for h in history])
+        keep = _downsample(axis, values)
+        dates = series.iso_dates(axis[keep])
+        values = values[keep].tolist()
+
+    return jsonify({'dates': dates, 'values': values})
+
+def _parse_date_arg(name):
+    try:
+        return date.fromisoformat(request.args.get(name, ''))
+    except ValueError:
+        return None
+
 @bp.route('/timeline')
 @login_required
+@cached_page
 def timeline_view():
     # Get filters from URL
     active_filters = request.args.getlist('type')
     if not active_filters:
         active_filters = None 
+    date_from = _parse_date_arg('from')
+    date_to = _parse_date_arg('to')
+    page_size = current_app.config['TIMELINE_PAGE_SIZE']
     
-    all_events = get_timeline_events(active_filters)
-    
-    today = date.today()
-    
-    # SPLIT LOGIC UPDATED:
-    # History = Everything <= Today
-    # Upcoming = Everything > Today
-    history = [e for e in all_events if e['date'] <= today]
-    upcoming = [e for e in all_events if e['date'] > today]
-    
-    # Sort History: Newest First (Descending)
-    history.sort(key=lambda x: x['date'], reverse=True)
-    
-    # Sort Upcoming: Soonest First (Ascending)
-    upcoming.sort(key=lambda x: x['date'])
+    # SPLIT LOGIC:
+    # History = Everything <= Today (Newest First)
+    # Upcoming = Everything > Today (Soonest First)
+    # Each section is its own keyset-paginated query.
+    history, history_next = get_timeline_page('history', active_filters, date_from, date_to,
+                                              cursor=request.args.get('history_after'), page_size=page_size)
+    upcoming, upcoming_next = get_timeline_page('upcoming', active_filters, date_from, date_to,
+                                                cursor=request.args.get('upcoming_after'), page_size=page_size)
     
     return render_template('timeline.html', 
                            history=history, 
                            upcoming=upcoming, 
+                           history_more_url=_current_url(history_after=history_next) if history_next else None,
+                           upcoming_more_url=_current_url(upcoming_after=upcoming_next) if upcoming_next else None,
+                           history_reset_url=_current_url(history_after=None) if request.args.get('history_after') else None,
+                           upcoming_reset_url=_current_url(upcoming_after=None) if request.args.get('upcoming_after') else None,
+                           date_from=date_from,
+                           date_to=date_to,
                            active_page='timeline',
                            current_filters=active_filters or [])
 
 # --- NEW: CONTACTS (Formerly Details) ---
 @bp.route('/contacts')
 @login_required
+@cached_page
 def contacts_view():
-    all_people = Person.query.order_by(Person.name).all()
-    
-    family_roles = ['Trustor', 'Trustee', 'Beneficiary', 'Executor']
-    family = [p for p in all_people if p.role in family_roles]
-    
-    pro_roles_meta = [
-        ('Attorney', 'Estate Attorney'),
-        ('Financial Advisor', 'Financial Advisor'),
-        ('Accountant', 'CPA / Accountant'),
-        ('Funeral Director', 'Funeral Service'),
-        ('Insurance', 'Insurance Agent'),
-        ('Medical', 'Primary Doctor')
-    ]
-    
-    pros = [p for p in all_people if p.role not in family_roles]
-    existing_roles = {p.role for p in pros}
-    
-    missing_pros = []
-    for role_code, label in pro_roles_meta:
-        if role_code not in existing_roles:
-            missing_pros.append({'role': role_code, 'label': label})
-            
+    # Family and professionals are separate aggregated queries; professionals are keyset-paginated
+    cursor = request.args.get('pros_after')
+    pros, pros_next = get_professionals_page(cursor, page_size=current_app.config['CONTACTS_PAGE_SIZE'])
+    pro_count, missing_pros = get_professional_roles()
+
     return render_template('contacts.html', 
-                           family=family, 
+                           family=get_family(), 
                            pros=pros, 
+                           pro_count=pro_count,
+                           pros_more_url=url_for('main.contacts_view', pros_after=pros_next) if pros_next else None,
+                           pros_reset_url=url_for('main.contacts_view') if cursor else None,
                            missing_pros=missing_pros,
                            active_page='contacts')
 
+# --- FORECAST ---
+@bp.route('/forecast')
+@login_required
+@cached_page
+def forecast_view():
+    forecast = get_forecast(request.args.get('months', MIN_MONTHS, type=int))
+    return render_template('forecast.html',
+                           forecast=forecast,
+                           months=len(forecast['months']),
+                           horizons=(12, 24, 36, 60),
+                           active_page='forecast')
+
+# --- SEARCH ---
+# kind -> (label, asset page tab or None). People link to their contact card.
+SEARCH_KINDS = {
+    'asset': ('Asset', None),
+    'pin': ('Pin', 'tab-systems'),
+    'structure': ('Accommodation', 'tab-structures'),
+    'bill': ('Bill', 'tab-bills'),
+    'vendor': ('Vendor', 'tab-team'),
+    'person': ('Contact', None),
+}
+
+@bp.route('/search')
+@login_required
+@cached_page
+def search_view():
+    query = request.args.get('q', '').strip()
+    results = search(query) if query else []
+    for r in results:
+        label, tab = SEARCH_KINDS[r['kind']]
+        r['label'] = label
+        if r['kind'] == 'person':
+            r['url'] = url_for('manage.edit_person', id=r['id'])
+        else:
+            r['url'] = url_for('main.asset_details', id=r['asset_id'], _anchor=tab)
+    return render_template('search.html', query=query, results=results, active_page='search')
+
 # --- NEW: DETAILS (High-Level Trust Info) ---
 @bp.route('/details')
 @login_required
@@ -1,6 +1,8 @@
 import json
 from datetime import date, datetime
 from flask import Blueprint, render_template, redirect, url_for, flash, request
+from sqlalchemy import update, func, case
+from sqlalchemy.orm.util import identity_key
 from src.extensions import db
 from src.models import Asset, Person, Appraisal, PropertyStructure, LocationPoint, RecurringBill, AssetVendor, TrustProfile
 from src.forms import (
@@ -8,6 +10,7 @@ from src.forms import (
     StructureForm, LocationPointForm, RecurringBillForm, AssetVendorForm, TrustProfileForm
 )
 from src.services.auth_service import login_required
+from src.services.valuation_service import drop_asset_series
 
 bp = Blueprint('manage', __name__, url_prefix='/manage')
 
@@ -149,6 +152,7 @@ def manage_asset(id):
 def delete_asset(id):
     asset = Asset.query.get_or_404(id)
     try:
+        drop_asset_series(asset.id)
         db.session.delete(asset)
         db.session.commit()
         flash(f'Deleted {asset.name}', 'success')
@@ -159,6 +163,26 @@ def delete_asset(id):
 
 # --- APPRAISALS ---
 
+def set_purchase_attributes(asset_id, purchase_date, purchase_price):
+    """
+    Update just the purchase keys of an asset's attributes in SQL (json_set /
+    json_remove) instead of rewriting the whole dict; the generated purchase
+    columns follow. None removes both keys.
+    """
+    attrs = case((func.json_type(Asset.attributes) == 'object', Asset.attributes), else_='{}')
+    if purchase_date is None:
+        value = func.json_remove(attrs, '$.purchase_date', '$.purchase_price')
+    else:
+        value = func.json_set(attrs, '$.purchase_date', purchase_date.isoformat(),
+                              '$.purchase_price', purchase_price)
+    db.session.execute(update(Asset).where(Asset.id == asset_id).values(attributes=value),
+                       execution_options={'synchronize_session': False})
+    # Objects already in the session reload the changed columns on next access
+    asset = db.session.identity_map.get(identity_key(Asset, asset_id))
+    if asset is not None:
+        db.session.expire(asset, ['attributes', 'purchase_date', 'purchase_price'])
+
+
 @bp.route('/asset/<int:id>/appraise', methods=['POST'])
 @login_required
 def add_appraisal(id):
@@ -173,8 +197,6 @@ def add_appraisal(id):
             notes=form.notes.data
         )
         db.session.add(appraisal)
-        if form.date.data:
-            asset.value_estimated = form.value.data
         try:
             db.session.commit()
             flash('Valuation added and asset updated.', 'success')
@@ -193,14 +215,8 @@ def edit_appraisal(id):
         appraisal.value = form.value.data
         appraisal.source = form.source.data
         appraisal.notes = form.notes.data
-        latest = Appraisal.query.filter_by(asset_id=appraisal.asset_id).order_by(Appraisal.date.desc()).first()
-        if latest and appraisal.id == latest.id:
-             appraisal.asset.value_estimated = form.value.data
         if appraisal.source == "Purchase":
-            attrs = dict(appraisal.asset.attributes or {})
-            attrs['purchase_date'] = appraisal.date.isoformat()
-            attrs['purchase_price'] = appraisal.value
-            appraisal.asset.attributes = attrs
+            set_purchase_attributes(appraisal.asset_id, appraisal.date, appraisal.value)
         try:
             db.session.commit()
             flash('Valuation updated successfully.', 'success')
@@ -220,16 +236,7 @@ def delete_appraisal(id):
     try:
         db.session.delete(appraisal)
         if is_purchase:
-            asset = Asset.query.get(asset_id)
-            attrs = dict(asset.attributes or {})
-            attrs.pop('purchase_date', None)
-            attrs.pop('purchase_price', None)
-            asset.attributes = attrs
-        db.session.commit()
-        latest = Appraisal.query.filter_by(asset_id=asset_id).order_by(Appraisal.date.desc()).first()
-        asset = Asset.query.get(asset_id)
-        if latest:
-            asset.value_estimated = latest.value
+            set_purchase_attributes(asset_id, None, None)
         db.session.commit()
         flash('Valuation deleted.', 'success')
     except Exception as e:
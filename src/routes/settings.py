@@ -1,32 +1,83 @@
-import io
 import zipfile
-from flask import Blueprint, render_template, send_file, request, flash, redirect, url_for
+from datetime import datetime
+from flask import Blueprint, render_template, request, flash, redirect, url_for, Response, stream_with_context, current_app, send_from_directory, abort
 from src.services.auth_service import login_required
-from src.services.export_service import generate_backup_zip
-from src.services.import_service import restore_from_json
+from src.extensions import db
+from src.services.export_service import stream_backup_zip, current_backup_id, check_incremental_base
+from src.services.import_service import restore_backup_chain
+from src.services.changelog_service import compact_change_log
+from src.services.snapshot_service import SNAPSHOT_PATTERN, list_snapshots, snapshot_dir
+from src.instrumentation import get_endpoint_summary, reset_samples
 
 bp = Blueprint('settings', __name__, url_prefix='/settings')
 
 @bp.route('/')
 @login_required
 def index():
-    return render_template('settings.html')
+    return render_template('settings.html', backup_id=current_backup_id(),
+                           snapshots=list_snapshots(snapshot_dir()),
+                           snapshot_interval=current_app.config['SNAPSHOT_INTERVAL_MINUTES'])
+
+@bp.route('/snapshots/<name>')
+@login_required
+def download_snapshot(name):
+    if not SNAPSHOT_PATTERN.match(name):
+        abort(404)
+    return send_from_directory(snapshot_dir(), name, as_attachment=True, mimetype='application/gzip')
+
+@bp.route('/performance')
+@login_required
+def performance():
+    return render_template('performance.html',
+                           enabled=current_app.config['PERF_INSTRUMENTATION'],
+                           slow_ms=current_app.config['PERF_SLOW_QUERY_MS'],
+                           rows=get_endpoint_summary(),
+                           pragmas=current_app.extensions.get('sqlite_pragmas', {}),
+                           active_page='settings')
+
+@bp.route('/performance/reset', methods=['POST'])
+@login_required
+def reset_performance():
+    reset_samples()
+    return redirect(url_for('settings.performance'))
 
 @bp.route('/download')
 @login_required
 def download_backup():
+    # ?since=<backup id>: incremental backup of the rows changed after that backup
+    since = request.args.get('since', type=int)
     try:
-        zip_buffer = generate_backup_zip()
-        return send_file(
-            zip_buffer,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name='estate_backup.zip'
-        )
+        if since is not None:
+            check_incremental_base(since)
+        backup_id = current_backup_id()
+    except ValueError as e:
+        flash(f"Incremental backup failed: {e}")
+        return redirect(url_for('settings.index'))
     except Exception as e:
         flash(f"Error creating backup: {str(e)}")
         return redirect(url_for('settings.index'))
 
+    # Streamed: the ZIP is built table by table while it is being sent
+    day = datetime.now().strftime('%Y%m%d')
+    if since is None:
+        filename = f"estate_backup_{day}_{backup_id}.zip"
+    else:
+        filename = f"estate_backup_{day}_{since}-{backup_id}.zip"
+    return Response(
+        stream_with_context(stream_backup_zip(backup_id, since)),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@bp.route('/compact-changes', methods=['POST'])
+@login_required
+def compact_changes():
+    # Drop change log entries superseded by later writes to the same row
+    removed = compact_change_log()
+    db.session.commit()
+    flash(f"Change log compacted: {removed} superseded entries removed.")
+    return redirect(url_for('settings.index'))
+
 @bp.route('/upload', methods=['POST'])
 @login_required
 def upload_backup():
@@ -34,20 +85,16 @@ def upload_backup():
         flash('No file part')
         return redirect(url_for('settings.index'))
         
-    file = request.files['backup_file']
-    if file.filename == '':
+    files = [f for f in request.files.getlist('backup_file') if f.filename]
+    if not files:
         flash('No selected file')
         return redirect(url_for('settings.index'))
 
-    if file:
-        # We expect a JSON file directly OR a ZIP containing it.
-        # For simplicity in V1, let's assume they upload the extracted JSON
-        # or we add logic to unzip. Let's stick to JSON upload for restore for now to be safe.
-        
-        # Note: If you want to support restoring from the ZIP, we need to unzip here.
-        # Let's try to detect.
+    # One full backup, optionally with the incremental backups taken after it.
+    # Each file is the JSON itself or a backup ZIP containing it.
+    contents = []
+    for file in files:
         content = None
-        
         if file.filename.endswith('.zip'):
             with zipfile.ZipFile(file) as z:
                 # Find the json file inside
@@ -57,14 +104,15 @@ def upload_backup():
                         break
         elif file.filename.endswith('.json'):
             content = file.read()
-            
-        if content:
-            success, msg = restore_from_json(content)
-            if success:
-                flash("Database restored successfully.")
-            else:
-                flash(f"Restore failed: {msg}")
-        else:
-            flash("Could not find valid JSON data in file.")
+        if not content:
+            flash(f"Could not find valid JSON data in {file.filename}.")
+            return redirect(url_for('settings.index'))
+        contents.append(content)
+
+    success, msg = restore_backup_chain(contents)
+    if success:
+        flash(msg)
+    else:
+        flash(f"Restore failed: {msg}")
             
     return redirect(url_for('settings.index'))
\ No newline at end of file
@@ -0,0 +1,134 @@
+from datetime import date
+from sqlalchemy import select, or_, tuple_, literal, union_all
+from src.extensions import db
+from src.models import Person, Asset
+
+# The assets page: one keyset-paginated query per section (assets, liabilities),
+# sorted and filtered by the database.
+#   - Every sort key is an indexed column; ties break on id, which SQLite keeps
+#     at the end of every index, so a page is one index range walk.
+#   - SQLite puts NULL keys first ascending and last descending. Pages over a
+#     nullable key therefore walk two ranges (NULL keys, then the rest, or the
+#     reverse) in one UNION ALL, and the cursor says which range it stopped in.
+
+# key -> (label, column, descending by default, cursor value parser)
+SORT_KEYS = {
+    'value': ('Value', Asset.value_estimated, True, float),
+    'name': ('Name', Asset.name, False, str),
+    'type': ('Type', Asset.asset_type, False, str),
+    'trust': ('Trust status', Asset.is_in_trust, True, lambda v: v == '1'),
+    'appraised': ('Last appraisal', Asset.latest_valuation_date, True, date.fromisoformat),
+}
+DEFAULT_SORT = 'value'
+
+SECTIONS = {
+    # NULL values count as assets (they display as $0)
+    'assets': or_(Asset.value_estimated >= 0, Asset.value_estimated.is_(None)),
+    'liabilities': Asset.value_estimated < 0,
+}
+
+
+def _encode_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(asset, sort):
+    """Keyset cursor for the URL: id|=sort value of the last asset shown ('id|' for a NULL value)."""
+    value = getattr(asset, SORT_KEYS[sort][1].key)
+    return f"{asset.id}|" + ('' if value is None else '=' + _encode_value(value))
+
+
+def decode_cursor(cursor, sort):
+    """(value, id) from a cursor, or None if it does not parse for this sort key."""
+    try:
+        asset_id, value = cursor.split('|', 1)
+        if value and not value.startswith('='):
+            return None
+        return (SORT_KEYS[sort][3](value[1:]) if value else None), int(asset_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _filters(asset_types=None, in_trust=None, owner_id=None):
+    criteria = []
+    if asset_types:
+        criteria.append(Asset.asset_type.in_(asset_types))
+    if in_trust is not None:
+        criteria.append(Asset.is_in_trust.is_(in_trust))
+    if owner_id is not None:
+        criteria.append(Asset.owner_id == owner_id)
+    return criteria
+
+
+def get_asset_page(section, sort=DEFAULT_SORT, descending=None, cursor=None, page_size=60,
+                   asset_types=None, in_trust=None, owner_id=None, options=()):
+    """
+    One page of a section of the assets page.
+        section: 'assets' or 'liabilities'
+        sort: a SORT_KEYS key; descending=None uses the key's default direction.
+              Liabilities reverse the value sort, so the largest debts come first either way.
+        asset_types / in_trust / owner_id: filters (None: no filter)
+        options: ORM loader options for the rows
+    Returns (assets, next_cursor) where next_cursor is None on the last page.
+    """
+    _, column, default_descending, _ = SORT_KEYS[sort]
+    descending = default_descending if descending is None else descending
+    if section == 'liabilities' and sort == 'value':
+        descending = not descending
+
+    def ordered(key, ids):
+        return (key.desc(), ids.desc()) if descending else (key, ids)
+
+    # The two ranges in display order: True = the NULL keys
+    phases = [False, True] if descending else [True, False]
+    if not column.nullable:
+        phases.remove(True)
+    after = decode_cursor(cursor, sort)
+    if after and (after[0] is None) not in phases:
+        after = None
+    start = phases.index(after[0] is None) if after else 0
+
+    # Each remaining range is its own limited index walk; UNION ALL runs them in one statement
+    ranges = []
+    for i, null_keys in enumerate(phases[start:], start):
+        stmt = (select(Asset.id.label('id'), literal(i).label('phase'), column.label('key'))
+                .where(SECTIONS[section], *_filters(asset_types, in_trust, owner_id),
+                       column.is_(None) if null_keys else column.is_not(None)))
+        if after and i == start:
+            value, after_id = after
+            if null_keys:
+                stmt = stmt.where(Asset.id < after_id if descending else Asset.id > after_id)
+            else:
+                key, bound = tuple_(column, Asset.id), tuple_(value, after_id)
+                stmt = stmt.where(key < bound if descending else key > bound)
+        ranges.append(select(stmt.order_by(*ordered(column, Asset.id)).limit(page_size + 1).subquery()))
+    page = (union_all(*ranges) if len(ranges) > 1 else ranges[0]).subquery()
+
+    rows = (Asset.query.options(*options)
+            .join(page, page.c.id == Asset.id)
+            .order_by(page.c.phase, *ordered(page.c.key, page.c.id))
+            .limit(page_size + 1)
+            .all())
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1], sort)
+    return rows, None
+
+
+def get_filter_choices():
+    """
+    Values for the filter controls: ([asset_type, ...], [(person id, name), ...] of owners).
+    """
+    types = db.session.scalars(
+        select(Asset.asset_type).where(Asset.asset_type.is_not(None)).distinct().order_by(Asset.asset_type)
+    ).all()
+    owners = db.session.execute(
+        select(Person.id, Person.name)
+        .where(select(Asset.id).where(Asset.owner_id == Person.id).exists())
+        .order_by(Person.name, Person.id)
+    ).all()
+    return types, owners
@@ -0,0 +1,97 @@
+from sqlalchemy import event, select, delete, insert, func, text, inspect
+from src.extensions import db
+from src.models import ChangeLog
+from src.services.export_service import BACKUP_TABLES, CHANGE_LOG_BASELINE, current_backup_id
+
+# Row-level change tracking for incremental backups (see export_service.py).
+#   - SQLite triggers on every backed-up table append (table, key) to
+#     change_log on insert, update and delete. Triggers rather than session
+#     hooks: association rows, cascades, bulk DML and raw SQL are all covered.
+#   - The log is append-only; compact_change_log() drops entries superseded by
+#     a later write to the same row, and everything below the baseline.
+#   - create_all installs the triggers too; migrated databases get them from
+#     the 'change log' revision, and every `flask db upgrade/downgrade`
+#     (migrations/env.py) re-creates any that a batch migration, which
+#     rebuilds its table, dropped.
+
+_TRIGGER_EVENTS = ('insert', 'update', 'delete')
+
+
+def _trigger_name(table, op):
+    return f"change_log_{table.name}_{op}"
+
+
+def trigger_ddl(table):
+    """CREATE TRIGGER statements logging every write to table."""
+    key = [c.name for c in table.primary_key.columns]
+
+    def log(row):
+        second = f"{row}.{key[1]}" if len(key) > 1 else '0'
+        return (f"INSERT INTO {ChangeLog.__tablename__} (table_name, row_id, row_id2) "
+                f"VALUES ('{table.name}', {row}.{key[0]}, {second});")
+
+    moved = ' OR '.join(f"OLD.{k} IS NOT NEW.{k}" for k in key)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'insert')} AFTER INSERT ON {table.name} "
+        f"BEGIN {log('NEW')} END",
+        # A changed key also logs the old key, which then reads as deleted
+        f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'update')} AFTER UPDATE ON {table.name} "
+        f"BEGIN {log('NEW')} "
+        f"INSERT INTO {ChangeLog.__tablename__} (table_name, row_id, row_id2) "
+        f"SELECT '{table.name}', OLD.{key[0]}, {'OLD.' + key[1] if len(key) > 1 else '0'} WHERE {moved}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'delete')} AFTER DELETE ON {table.name} "
+        f"BEGIN {log('OLD')} END",
+    ]
+
+
+def reset_change_log(restored_backup_id=0):
+    """
+    Start a new history after a restore: clear the log and add a baseline
+    above both every change so far and the restored backup's id, so no
+    earlier backup can be the base of an incremental one.
+    """
+    baseline = max(current_backup_id(), restored_backup_id or 0) + 1
+    db.session.execute(delete(ChangeLog))
+    db.session.execute(insert(ChangeLog), [{'seq': baseline, 'table_name': CHANGE_LOG_BASELINE, 'row_id': 0}])
+
+
+def compact_change_log():
+    """Keep only the latest entry per row (all an incremental backup needs) at or above the baseline."""
+    baseline = select(func.max(ChangeLog.seq)).where(ChangeLog.table_name == CHANGE_LOG_BASELINE).scalar_subquery()
+    latest = (select(func.max(ChangeLog.seq))
+              .group_by(ChangeLog.table_name, ChangeLog.row_id, ChangeLog.row_id2))
+    return db.session.execute(
+        delete(ChangeLog).where((ChangeLog.seq < baseline) | ChangeLog.seq.not_in(latest))
+    ).rowcount
+
+
+def install_missing_triggers(connection):
+    """
+    Create whichever change log triggers are missing (on tables that exist);
+    returns how many were. No-op before the change log revision.
+    """
+    existing_tables = set(inspect(connection).get_table_names())
+    if ChangeLog.__tablename__ not in existing_tables:
+        return 0
+    existing = set(connection.scalars(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")))
+    missing = 0
+    for _, table in BACKUP_TABLES:
+        if table.name not in existing_tables:
+            continue
+        for op, statement in zip(_TRIGGER_EVENTS, trigger_ddl(table)):
+            if _trigger_name(table, op) not in existing:
+                connection.execute(text(statement))
+                missing += 1
+    return missing
+
+
+def _create_triggers(target, connection, **kw):
+    install_missing_triggers(connection)
+    if connection.scalar(select(func.count()).select_from(ChangeLog)) == 0:
+        connection.execute(insert(ChangeLog), [{'table_name': CHANGE_LOG_BASELINE, 'row_id': 0}])
+
+
+def init_change_log(app):
+    # create_all (scripts, fresh installs) adds the triggers and the first baseline
+    if not event.contains(db.metadata, 'after_create', _create_triggers):
+        event.listen(db.metadata, 'after_create', _create_triggers)
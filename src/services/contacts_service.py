@@ -0,0 +1,112 @@
+from sqlalchemy import select, func, or_, tuple_, JSON
+from src.extensions import db
+from src.models import Person, Asset, AssetVendor, asset_beneficiaries
+
+# The contacts hub, built from aggregated queries rather than per-person
+# relationships: the role split happens in SQL, and each card's asset links
+# come pre-joined as a JSON list (first CHIP_LIMIT by name) plus a full count.
+
+FAMILY_ROLES = ('Trustor', 'Trustee', 'Beneficiary', 'Executor')
+
+# Professional roles every estate should have on file: (role, label)
+PROFESSIONAL_SLOTS = [
+    ('Attorney', 'Estate Attorney'),
+    ('Financial Advisor', 'Financial Advisor'),
+    ('Accountant', 'CPA / Accountant'),
+    ('Funeral Director', 'Funeral Service'),
+    ('Insurance', 'Insurance Agent'),
+    ('Medical', 'Primary Doctor'),
+]
+
+CHIP_LIMIT = 12
+
+_is_family = Person.role.in_(FAMILY_ROLES)
+_is_professional = or_(Person.role.is_(None), Person.role.not_in(FAMILY_ROLES))
+
+
+def _chips(columns, *criteria):
+    """
+    Correlated subquery: JSON list of the first CHIP_LIMIT rows (by asset name)
+    matching criteria, each an object of columns ({'label': column, ...}).
+    """
+    inner = (select(*(c.label(k) for k, c in columns.items()))
+             .where(*criteria).order_by(columns['name']).limit(CHIP_LIMIT)
+             .correlate(Person).subquery())
+    pairs = [arg for k in columns for arg in (k, inner.c[k])]
+    return select(func.json_group_array(func.json_object(*pairs), type_=JSON)).scalar_subquery()
+
+
+def _count(*criteria):
+    return select(func.count()).where(*criteria).correlate(Person).scalar_subquery()
+
+
+_PERSON_COLUMNS = (Person.id, Person.name, Person.role, Person.email, Person.phone, Person.attributes)
+
+
+def get_family():
+    """
+    Trust & family contacts by name, with the assets they own and inherit.
+    Rows: id, name, role, email, phone, attributes,
+          owned / inherited: [{'id', 'name'}, ...], owned_count / inherited_count
+    """
+    owns = Asset.owner_id == Person.id
+    inherits = (asset_beneficiaries.c.person_id == Person.id, asset_beneficiaries.c.asset_id == Asset.id)
+    return db.session.execute(
+        select(
+            *_PERSON_COLUMNS,
+            _chips({'id': Asset.id, 'name': Asset.name}, owns).label('owned'),
+            _count(owns).label('owned_count'),
+            _chips({'id': Asset.id, 'name': Asset.name}, *inherits).label('inherited'),
+            _count(asset_beneficiaries.c.person_id == Person.id).label('inherited_count'),
+        ).where(_is_family).order_by(Person.name, Person.id)
+    ).all()
+
+
+def encode_cursor(person):
+    """Keyset cursor for the URL: id|name of the last contact shown."""
+    return f"{person.id}|{person.name}"
+
+
+def decode_cursor(cursor):
+    try:
+        person_id, name = cursor.split('|', 1)
+        return name, int(person_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def get_professionals_page(cursor=None, page_size=48):
+    """
+    One page of the professional contacts (every non-family role), by name.
+    Rows: id, name, role, email, phone, attributes,
+          jobs: [{'id', 'name', 'role'}, ...] (asset id/name, vendor role), job_count
+    Returns (rows, next_cursor) where next_cursor is None on the last page.
+    """
+    serves = (AssetVendor.person_id == Person.id, AssetVendor.asset_id == Asset.id)
+    stmt = select(
+        *_PERSON_COLUMNS,
+        _chips({'id': Asset.id, 'name': Asset.name, 'role': AssetVendor.role}, *serves).label('jobs'),
+        _count(AssetVendor.person_id == Person.id).label('job_count'),
+    ).where(_is_professional)
+
+    after = decode_cursor(cursor)
+    if after:
+        stmt = stmt.where(tuple_(Person.name, Person.id) > tuple_(*after))
+    rows = db.session.execute(stmt.order_by(Person.name, Person.id).limit(page_size + 1)).all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def get_professional_roles():
+    """
+    Professional contacts per role, in one grouped query.
+    Returns (total, missing) where missing lists the PROFESSIONAL_SLOTS nobody fills:
+    [{'role', 'label'}, ...]
+    """
+    counts = dict(db.session.execute(
+        select(Person.role, func.count()).where(_is_professional).group_by(Person.role)
+    ).all())
+    missing = [{'role': role, 'label': label} for role, label in PROFESSIONAL_SLOTS if role not in counts]
+    return sum(counts.values()), missing
@@ -1,51 +1,210 @@
 import json
-import io
+import html
 import zipfile
 from datetime import datetime, date
-from src.models import Person, Asset, Milestone, Task, Appraisal
+from flask import current_app
+from sqlalchemy import select, func, and_, true
+from src.extensions import db
+from src.models import (
+    Person, Asset, Milestone, Task, Appraisal, PropertyStructure, LocationPoint,
+    RecurringBill, AssetVendor, TrustProfile, asset_beneficiaries, ChangeLog
+)
+
+BACKUP_VERSION = "2.0"
+
+# Every table in the vault, in dependency order (parents before children).
+# Restore inserts in this order and clears in reverse.
+# ValuationPoint is derived data and is rebuilt on restore instead.
+BACKUP_TABLES = [
+    ('trust_profile', TrustProfile.__table__),
+    ('people', Person.__table__),
+    ('assets', Asset.__table__),
+    ('asset_beneficiaries', asset_beneficiaries),
+    ('appraisals', Appraisal.__table__),
+    ('structures', PropertyStructure.__table__),
+    ('location_points', LocationPoint.__table__),
+    ('bills', RecurringBill.__table__),
+    ('vendors', AssetVendor.__table__),
+    ('milestones', Milestone.__table__),
+    ('tasks', Task.__table__),
+]
+
+# Rows fetched from the database per round trip while streaming
+EXPORT_BATCH_SIZE = 500
+
+# Incremental backups
+#   - Every write to a row of BACKUP_TABLES is appended to change_log by
+#     triggers (see changelog_service.py). A backup's id is the highest change
+#     seq when it started.
+#   - An incremental backup since an earlier backup id holds the current
+#     state of every row written after it, and the keys of those since deleted.
+#   - The id is read before any table, so a write made while a backup streams
+#     is at worst also included in the next increment (rows are upserted).
+#   - A restore replaces the history: it logs a baseline entry above every id
+#     restored, and older ids no longer chain.
+CHANGE_LOG_BASELINE = '@baseline'
+
+
+def backup_columns(table):
+    """Stored columns of a table; generated columns are recomputed by the database."""
+    return [c for c in table.columns if c.computed is None]
+
 
 def serialize_model(instance):
     """Converts a SQLAlchemy model instance into a dictionary."""
+    return serialize_row(instance.__table__, {c.name: getattr(instance, c.name) for c in backup_columns(instance.__table__)})
+
+
+def serialize_row(table, row):
+    """Converts a table row mapping into a JSON-ready dictionary."""
     data = {}
-    for column in instance.__table__.columns:
-        value = getattr(instance, column.name)
+    for column in backup_columns(table):
+        value = row[column.name]
         if isinstance(value, (datetime, date)): # Added date support
             value = value.isoformat()
         data[column.name] = value
     return data
 
-def generate_backup_zip():
-    data = {
-        "version": "1.1", # Bumped version
-        "timestamp": datetime.now().isoformat(),
-        "people": [serialize_model(p) for p in Person.query.all()],
-        "assets": [serialize_model(a) for a in Asset.query.all()],
-        "appraisals": [serialize_model(a) for a in Appraisal.query.all()], # NEW
-        "milestones": [serialize_model(m) for m in Milestone.query.all()],
-        "tasks": [serialize_model(t) for t in Task.query.all()]
-    }
 
-    json_dump = json.dumps(data, indent=4)
+def current_backup_id():
+    """Id of a backup taken now: the latest change seq."""
+    return db.session.scalar(select(func.max(ChangeLog.seq))) or 0
+
+
+def check_incremental_base(since):
+    """Raise ValueError unless an incremental backup can be taken since backup id `since`."""
+    baseline = db.session.scalar(
+        select(func.max(ChangeLog.seq)).where(ChangeLog.table_name == CHANGE_LOG_BASELINE)
+    ) or 0
+    if since < baseline:
+        raise ValueError(f"Backup {since} predates the last restore (change {baseline}); take a full backup first.")
+    if since > current_backup_id():
+        raise ValueError(f"Backup {since} is not from this vault; take a full backup first.")
+
+
+def _changed_keys(table, since):
+    """Keys of the rows of table written after change seq `since`."""
+    return (select(ChangeLog.row_id, ChangeLog.row_id2)
+            .where(ChangeLog.table_name == table.name, ChangeLog.seq > since)
+            .distinct().subquery())
+
+
+def _key_match(table, keys):
+    key = list(table.primary_key.columns)
+    return and_(key[0] == keys.c.row_id, key[1] == keys.c.row_id2 if len(key) > 1 else true())
+
 
-    html_content = f"""
+def iter_table_rows(table, batch_size=EXPORT_BATCH_SIZE, since=None):
+    """Yield serialized rows of a table without loading it all at once (since: only rows changed after it)."""
+    stmt = select(*backup_columns(table)).order_by(*table.primary_key.columns)
+    if since is not None:
+        keys = _changed_keys(table, since)
+        stmt = stmt.join(keys, _key_match(table, keys))
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for row in result.mappings():
+        yield serialize_row(table, row)
+
+
+def deleted_keys(table, since):
+    """Primary keys (as lists) of the rows of table deleted after change seq `since`."""
+    keys = _changed_keys(table, since)
+    key = list(table.primary_key.columns)
+    rows = db.session.execute(
+        select(keys.c.row_id, keys.c.row_id2)
+        .outerjoin(table, _key_match(table, keys))
+        .where(key[0].is_(None))
+        .order_by(keys.c.row_id, keys.c.row_id2)
+    )
+    return [[row_id, row_id2][:len(key)] for row_id, row_id2 in rows]
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object; zipfile writes into it and we drain it as we go."""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_backup_zip(backup_id=None, since=None):
+    """
+    Generator producing a backup ZIP chunk by chunk:
+        estate_data_YYYYMMDD.json  - every table, written row by row
+        READ_ME_YYYYMMDD.html      - human-readable asset summary
+    Memory use stays bounded by EXPORT_BATCH_SIZE rows regardless of vault size.
+        backup_id: current_backup_id(), if the caller already read it
+        since: a backup id; write an incremental backup of the rows changed after
+               it (plus a "deleted" section). Check it with check_incremental_base().
+    """
+    if backup_id is None:
+        backup_id = current_backup_id()
+    timestamp = datetime.now()
+    day = timestamp.strftime('%Y%m%d')
+    sink = _ChunkSink()
+
+    header = {'version': BACKUP_VERSION, 'timestamp': timestamp.isoformat(),
+              'kind': 'full' if since is None else 'incremental', 'backup_id': backup_id}
+    if since is not None:
+        header['base_backup_id'] = since
+
+    # Entry sizes are unknown up front, so both entries are ZIP64 (a vault may pass 4 GiB).
+    # If anything fails mid-stream the central directory is never written: the
+    # download then fails to open rather than passing for a complete backup.
+    zf = zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED)
+    try:
+        with zf.open(f"estate_data_{day}.json", 'w', force_zip64=True) as out:
+            out.write(('{' + ','.join(f'\n    {json.dumps(k)}: {json.dumps(v)}' for k, v in header.items())).encode())
+            for key, table in BACKUP_TABLES:
+                out.write(f',\n    {json.dumps(key)}: ['.encode())
+                for i, row in enumerate(iter_table_rows(table, since=since)):
+                    out.write(((',' if i else '') + '\n        ' + json.dumps(row)).encode())
+                    if sink.chunks:
+                        yield sink.drain()
+                out.write(b'\n    ]')
+            if since is not None:
+                deleted = {key: deleted_keys(table, since) for key, table in BACKUP_TABLES}
+                out.write(f',\n    "deleted": {json.dumps({k: v for k, v in deleted.items() if v})}'.encode())
+            out.write(b'\n}\n')
+        yield sink.drain()
+
+        with zf.open(f"READ_ME_{day}.html", 'w', force_zip64=True) as out:
+            out.write(f"""
     <html>
-    <head><title>Estate Backup {data['timestamp']}</title></head>
+    <head><title>Estate Backup {timestamp.isoformat()}</title></head>
     <body>
         <h1>Estate Data Backup</h1>
-        <p>Generated: {data['timestamp']}</p>
+        <p>Generated: {timestamp.isoformat()} (backup {backup_id}{'' if since is None else f', changes since backup {since}'})</p>
         <hr>
         <h2>Assets & Valuations</h2>
         <ul>
-            {''.join([f"<li>{a['name']} (${a.get('value_estimated', 0)})</li>" for a in data['assets']])}
-        </ul>
+""".encode())
+            stmt = select(Asset.name, Asset.value_estimated).order_by(Asset.id)
+            if since is not None:
+                keys = _changed_keys(Asset.__table__, since)
+                stmt = stmt.join(keys, _key_match(Asset.__table__, keys))
+            rows = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for name, value in rows:
+                out.write(f"            <li>{html.escape(name)} (${value or 0})</li>\n".encode())
+                if sink.chunks:
+                    yield sink.drain()
+            out.write(b"""        </ul>
     </body>
     </html>
-    """
-
-    memory_file = io.BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr(f"estate_data_{datetime.now().strftime('%Y%m%d')}.json", json_dump)
-        zf.writestr(f"READ_ME_{datetime.now().strftime('%Y%m%d')}.html", html_content)
+""")
+    except Exception:
+        current_app.logger.exception("Backup stream failed; archive left without a central directory")
+        return
 
-    memory_file.seek(0)
-    return memory_file
\ No newline at end of file
+    # Central directory is written when the archive closes
+    zf.close()
+    yield sink.drain()
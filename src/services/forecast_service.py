@@ -0,0 +1,156 @@
+import heapq
+import calendar
+import functools
+from datetime import date
+from itertools import count, islice
+import numpy as np
+from sqlalchemy import select
+from src.extensions import db
+from src.models import Asset, RecurringBill
+
+# Holding-cost forecast from the recurring bills.
+#   - A bill repeats every FREQUENCY_MONTHS[frequency] months from its
+#     next_due_date; bills with an unknown frequency occur once.
+#   - Occurrences are never stored. The monthly aggregates come from one
+#     vectorised pass over (bill, month index) pairs; the "next payments" list
+#     lazily merges per-bill generators and stops after the first few.
+#   - Projections are cached on the bill rows themselves, so any bill edit
+#     (or a new month) produces a new key and nothing needs invalidating.
+
+FREQUENCY_MONTHS = {
+    'Monthly': 1,
+    'Quarterly': 3,
+    'Semi-Annual': 6,
+    'Annual': 12,
+}
+
+MIN_MONTHS, MAX_MONTHS = 12, 60
+
+
+def _month_index(d):
+    return d.year * 12 + d.month - 1
+
+
+def _add_months(d, months, day):
+    """d moved by whole months, on `day` (clamped to the month's length, e.g. Jan 31 -> Feb 28)."""
+    year, month = divmod(d.year * 12 + d.month - 1 + months, 12)
+    month += 1
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def occurrences(due, frequency, start):
+    """Lazily yield every due date on or after start (finite only for one-off bills)."""
+    step = FREQUENCY_MONTHS.get(frequency)
+    if step is None:
+        if due >= start:
+            yield due
+        return
+    # Skip whole periods that are already past without stepping through them
+    behind = max(0, _month_index(start) - _month_index(due))
+    for n in count(behind // step):
+        d = _add_months(due, n * step, due.day)
+        if d >= start:
+            yield d
+
+
+def _payments(bill, start):
+    return ((d, bill) for d in occurrences(bill.next_due_date, bill.frequency, start))
+
+
+def _bill_rows():
+    return tuple(db.session.execute(
+        select(RecurringBill.id, RecurringBill.name, RecurringBill.payee, RecurringBill.amount_estimated,
+               RecurringBill.frequency, RecurringBill.next_due_date, RecurringBill.is_autopay,
+               RecurringBill.asset_id, Asset.name.label('asset_name'))
+        .join(Asset, Asset.id == RecurringBill.asset_id)
+        .order_by(RecurringBill.id)
+    ).all())
+
+
+@functools.lru_cache(maxsize=32)
+def _project(rows, first_month, months):
+    """
+    Monthly outflows for months [first_month, first_month + months), from bill rows.
+    Returns (by_month, assets, by_asset, payees, by_payee): numpy totals and their labels.
+    """
+    scheduled = [r for r in rows if r.next_due_date is not None]
+    n_bills = len(scheduled)
+    amount = np.array([r.amount_estimated or 0.0 for r in scheduled], dtype=float)
+    # Unknown frequency: a step longer than the horizon gives exactly one occurrence
+    step = np.array([FREQUENCY_MONTHS.get(r.frequency, months + 1) for r in scheduled], dtype=np.int64)
+    first = np.array([_month_index(r.next_due_date) for r in scheduled], dtype=np.int64) - first_month
+    one_off = np.array([r.frequency not in FREQUENCY_MONTHS for r in scheduled], dtype=bool)
+
+    # Recurring bills already past due roll forward to their first period in range
+    behind = (first < 0) & ~one_off
+    first[behind] += -(first[behind] // step[behind]) * step[behind]
+    first[one_off & (first < 0)] = months  # one-off bills in the past are out of range
+
+    # Occurrences per bill inside the horizon, then one flat (bill, month) list
+    per_bill = np.where(first < months, (months - 1 - first) // step + 1, 0).clip(min=0)
+    bill_of = np.repeat(np.arange(n_bills), per_bill)
+    nth = np.arange(len(bill_of)) - np.repeat(np.cumsum(per_bill) - per_bill, per_bill)
+    month = first[bill_of] + nth * step[bill_of]
+    paid = amount[bill_of]
+
+    by_month = np.bincount(month, weights=paid, minlength=months)
+
+    asset_ids = sorted({r.asset_id for r in scheduled})
+    asset_pos = {a: i for i, a in enumerate(asset_ids)}
+    asset_code = np.array([asset_pos[r.asset_id] for r in scheduled], dtype=np.int64)
+    by_asset = np.bincount(asset_code[bill_of] * months + month, weights=paid,
+                           minlength=len(asset_ids) * months).reshape(len(asset_ids), months)
+
+    payees = sorted({r.payee or r.name for r in scheduled})
+    payee_pos = {p: i for i, p in enumerate(payees)}
+    payee_code = np.array([payee_pos[r.payee or r.name] for r in scheduled], dtype=np.int64)
+    by_payee = np.bincount(payee_code[bill_of], weights=paid, minlength=len(payees))
+
+    asset_names = {r.asset_id: r.asset_name for r in scheduled}
+    return by_month, [(a, asset_names[a]) for a in asset_ids], by_asset, payees, by_payee
+
+
+@functools.lru_cache(maxsize=32)
+def _next_payments(rows, start, limit):
+    """First `limit` payments on or after start: merge the per-bill date streams, stop early."""
+    streams = [_payments(r, start) for r in rows if r.next_due_date is not None]
+    merged = heapq.merge(*streams, key=lambda item: (item[0], item[1].id))
+    return [{
+        'date': d, 'name': r.name, 'payee': r.payee, 'amount': r.amount_estimated or 0.0,
+        'asset_id': r.asset_id, 'asset_name': r.asset_name, 'is_autopay': r.is_autopay,
+    } for d, r in islice(merged, limit)]
+
+
+def get_forecast(months=12, today=None, upcoming=10):
+    """
+    Holding costs for the `months` calendar months starting with the current one.
+    Returns {
+        'months': ['YYYY-MM', ...], 'by_month': [float, ...], 'total', 'monthly_average',
+        'by_asset': [{'id', 'name', 'total', 'by_month'}, ...],  # largest first
+        'by_payee': [{'payee', 'total'}, ...],                     # largest first
+        'upcoming': [{'date', 'name', 'payee', 'amount', 'asset_id', 'asset_name', 'is_autopay'}, ...],
+        'unscheduled': int  # bills without a next due date
+    }
+    """
+    months = min(max(int(months), MIN_MONTHS), MAX_MONTHS)
+    today = today or date.today()
+    first_month = _month_index(today)
+    rows = _bill_rows()
+
+    by_month, assets, by_asset, payees, by_payee = _project(rows, first_month, months)
+
+    asset_order = np.argsort(-by_asset.sum(axis=1), kind='stable')
+    payee_order = np.argsort(-by_payee, kind='stable')
+
+    total = float(by_month.sum())
+    return {
+        'months': [f"{(first_month + i) // 12:04d}-{(first_month + i) % 12 + 1:02d}" for i in range(months)],
+        'by_month': by_month.tolist(),
+        'total': total,
+        'monthly_average': total / months,
+        'by_asset': [{'id': assets[i][0], 'name': assets[i][1], 'total': float(by_asset[i].sum()),
+                      'by_month': by_asset[i].tolist()} for i in asset_order],
+        'by_payee': [{'payee': payees[i], 'total': float(by_payee[i])} for i in payee_order],
+        'upcoming': _next_payments(rows, today, upcoming),
+        'unscheduled': sum(1 for r in rows if r.next_due_date is None),
+    }
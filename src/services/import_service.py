@@ -1,81 +1,184 @@
 import json
+import time
 from datetime import datetime, date
+from flask import current_app
+from sqlalchemy import Date, DateTime, delete, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from src.extensions import db
-from src.models import Person, Asset, Milestone, Task, Appraisal
+from src.models import ValuationPoint
+from src.services.export_service import BACKUP_TABLES, backup_columns
+from src.services.valuation_service import rebuild_series, refresh_asset_valuations
+from src.services.search_service import rebuild_search_index
+from src.services.changelog_service import reset_change_log
+
+
+def _parse_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _parse_datetime(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _row_builder(table):
+    """
+    Returns a function turning a backup dict into a complete insert row for table.
+    Every row gets every column so the whole table can go out as one executemany.
+    """
+    plan = []
+    for column in backup_columns(table):
+        default = None
+        if column.default is not None and column.default.is_scalar:
+            default = column.default.arg
+
+        parse = None
+        if isinstance(column.type, DateTime):
+            parse = _parse_datetime
+        elif isinstance(column.type, Date):
+            parse = _parse_date
+
+        # Required dates fall back to today (matches the old importer's appraisal handling)
+        fallback = date.today() if parse is _parse_date and not column.nullable else None
+        plan.append((column.name, parse, default, fallback))
+
+    def build(data):
+        row = {}
+        for name, parse, default, fallback in plan:
+            value = data.get(name, default)
+            if parse and value is not None:
+                try:
+                    value = parse(value)
+                except (TypeError, ValueError):
+                    value = fallback
+            elif parse and value is None:
+                value = fallback
+            row[name] = value
+        return row
+
+    return build
+
+
+def order_backup_chain(backups):
+    """
+    Sort parsed backups into restore order: the one full backup, then each
+    incremental backup whose base is the previous backup's id.
+    Raises ValueError if they do not form a single unbroken chain.
+    """
+    full = [b for b in backups if b.get('kind', 'full') == 'full']
+    if len(full) != 1:
+        raise ValueError(f"Expected exactly one full backup, got {len(full)}.")
+
+    by_base = {}
+    for backup in backups:
+        if backup.get('kind') == 'incremental':
+            if backup.get('base_backup_id') in by_base:
+                raise ValueError(f"Two incremental backups since backup {backup.get('base_backup_id')}.")
+            by_base[backup.get('base_backup_id')] = backup
+
+    chain = full
+    while chain[-1].get('backup_id') in by_base:
+        chain.append(by_base.pop(chain[-1]['backup_id']))
+    if by_base:
+        bases = ', '.join(str(base) for base in sorted(by_base, key=str))
+        raise ValueError(f"Incremental backups since {bases} do not follow backup {chain[-1].get('backup_id')}.")
+    return chain
+
+
+def _upsert(table):
+    key = [c.name for c in table.primary_key.columns]
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=key,
+        set_={c.name: stmt.excluded[c.name] for c in backup_columns(table) if c.name not in key},
+    )
+
+
+def _apply_increment(data, bulk):
+    """Upsert the changed rows (parents first), then delete the removed ones (children first)."""
+    report = []
+    for key, table in BACKUP_TABLES:
+        build = _row_builder(table)
+        rows = [build(r) for r in data.get(key) or []]
+        if rows:
+            db.session.execute(_upsert(table), rows, execution_options=bulk)
+        report.append((key, len(rows)))
+
+    deleted = data.get('deleted') or {}
+    for key, table in reversed(BACKUP_TABLES):
+        keys = [tuple(k) for k in deleted.get(key) or []]
+        if keys:
+            columns = list(table.primary_key.columns)
+            db.session.execute(table.delete().where(tuple_(*columns).in_(keys)), execution_options=bulk)
+    return report
+
 
 def restore_from_json(json_content):
+    """Replace the whole vault with the contents of one full backup (see restore_backup_chain)."""
+    return restore_backup_chain([json_content])
+
+
+def restore_backup_chain(json_contents):
+    """
+    Replace the whole vault with a full backup plus any incremental backups
+    taken after it (in any order; they must chain by backup id).
+    All tables are cleared and bulk-inserted (one executemany per table, in
+    dependency order), each increment is applied on top, and derived data is
+    rebuilt once, inside a single transaction; any failure rolls back.
+    Returns (success, message) where message reports per-table row counts and timings.
+    """
     try:
-        data = json.loads(json_content)
-        
-        # 1. Clear current data
-        db.session.query(Appraisal).delete() # NEW
-        db.session.query(Task).delete()
-        db.session.query(Milestone).delete()
-        db.session.execute(db.text("DELETE FROM asset_beneficiaries"))
-        db.session.query(Asset).delete()
-        db.session.query(Person).delete()
-        
-        # 2. Rebuild People
-        for p_data in data.get('people', []):
-            person = Person(
-                id=p_data['id'],
-                name=p_data['name'],
-                role=p_data.get('role'),
-                email=p_data.get('email'),
-                phone=p_data.get('phone'),
-                attributes=p_data.get('attributes', {})
-            )
-            db.session.add(person)
-        
-        # 3. Rebuild Assets
-        for a_data in data.get('assets', []):
-            asset = Asset(
-                id=a_data['id'],
-                name=a_data['name'],
-                asset_type=a_data.get('asset_type'),
-                is_in_trust=a_data.get('is_in_trust'),
-                owner_id=a_data.get('owner_id'),
-                value_estimated=a_data.get('value_estimated'),
-                attributes=a_data.get('attributes', {})
-            )
-            db.session.add(asset)
-
-        # 4. Rebuild Appraisals (NEW)
-        for app_data in data.get('appraisals', []):
-            # Parse Date
-            d_val = date.today()
-            if app_data.get('date'):
-                try:
-                    d_val = date.fromisoformat(app_data['date'])
-                except:
-                    pass 
-            
-            appraisal = Appraisal(
-                asset_id=app_data['asset_id'],
-                date=d_val,
-                value=app_data['value'],
-                source=app_data.get('source'),
-                notes=app_data.get('notes')
-            )
-            db.session.add(appraisal)
-
-        # 5. Rebuild Milestones
-        for m_data in data.get('milestones', []):
-            d_event = None
-            if m_data.get('date_event'):
-                d_event = datetime.fromisoformat(m_data['date_event'])
-
-            milestone = Milestone(
-                title=m_data['title'],
-                description=m_data.get('description'),
-                is_completed=m_data.get('is_completed'),
-                date_event=d_event
-            )
-            db.session.add(milestone)
+        started = time.perf_counter()
+        full, *increments = order_backup_chain([json.loads(content) for content in json_contents])
+        data = full
+
+        # The appraisal and search write hooks are skipped; everything derived is rebuilt once in step 4
+        bulk = {'skip_valuation_sync': True, 'skip_search_sync': True}
+
+        # 1. Clear current data (children first)
+        db.session.execute(delete(ValuationPoint))
+        for _, table in reversed(BACKUP_TABLES):
+            db.session.execute(table.delete(), execution_options=bulk)
+
+        # 2. Rebuild every table with one bulk insert each
+        report = []
+        for key, table in BACKUP_TABLES:
+            table_started = time.perf_counter()
+            build = _row_builder(table)
+            rows = [build(r) for r in data.get(key) or []]
+            if rows:
+                db.session.execute(table.insert(), rows, execution_options=bulk)
+            report.append((key, len(rows), time.perf_counter() - table_started))
+
+        # 3. Replay the incremental backups in chain order
+        for increment in increments:
+            increment_started = time.perf_counter()
+            changed = sum(count for _, count in _apply_increment(increment, bulk))
+            report.append((f"increment_{increment['backup_id']}", None, time.perf_counter() - increment_started))
+            current_app.logger.info("restore: increment %s -> %s, %d rows upserted",
+                                    increment['base_backup_id'], increment['backup_id'], changed)
+
+        # 4. Recompute the dashboard valuation series and the cached latest-valuation
+        #    date/count (older backups lack them). value_estimated is kept as backed up.
+        series_started = time.perf_counter()
+        refresh_asset_valuations(values=False)
+        rebuild_series()
+        report.append(('valuation_series', None, time.perf_counter() - series_started))
+
+        search_started = time.perf_counter()
+        rebuild_search_index()
+        report.append(('search_index', None, time.perf_counter() - search_started))
+
+        # The restored vault starts a new change history
+        reset_change_log((increments or [full])[-1].get('backup_id') or 0)
 
         db.session.commit()
-        return True, "Restore Successful"
+
+        for key, count, seconds in report:
+            current_app.logger.info("restore: %-20s %8s rows  %.3fs", key, count if count is not None else '-', seconds)
+        counts = ", ".join(f"{count} {key}" for key, count, _ in report if count)
+        chained = f" plus {len(increments)} incremental backup{'s' if len(increments) != 1 else ''}" if increments else ''
+        return True, f"Database restored: {counts or 'empty backup'}{chained} in {time.perf_counter() - started:.2f}s."
 
     except Exception as e:
         db.session.rollback()
-        return False, str(e)
\ No newline at end of file
+        return False, str(e)
@@ -0,0 +1,192 @@
+import re
+from markupsafe import escape, Markup
+from sqlalchemy import event, select, text, bindparam, DDL
+from sqlalchemy.orm import Session
+from src.extensions import db
+from src.models import Person, Asset, PropertyStructure, LocationPoint, RecurringBill, AssetVendor
+
+# Full-text search over the free text of the vault, in one SQLite FTS5 table.
+#   - One document per record; rowid = record id * 8 + kind code, so a single
+#     record is replaced or removed by rowid without scanning the index.
+#   - Documents are built by SQL (INSERT ... SELECT, JSON leaves via json_tree),
+#     for one record or a whole table alike.
+#   - Kept in step like the valuation series: ORM changes are collected in
+#     after_flush and reindexed in after_flush_postexec; bulk DML on an indexed
+#     table reindexes that table right after the statement. Pass
+#     execution_options={'skip_search_sync': True} to opt out (restore does,
+#     then calls rebuild_search_index() once).
+
+SEARCH_TABLE = 'search_index'
+
+_CREATE = (f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+           "kind UNINDEXED, asset_id UNINDEXED, title, body, tokenize='porter unicode61')")
+_DROP = f"DROP TABLE IF EXISTS {SEARCH_TABLE}"
+_create_ddl = DDL(_CREATE)
+_drop_ddl = DDL(_DROP)
+
+
+def _json_text(column):
+    """SQL for the searchable text of a JSON column: 'key value' for every leaf."""
+    return (f"(SELECT group_concat(CASE WHEN typeof(key) = 'text' THEN key || ' ' ELSE '' END || value, ' ') "
+            f"FROM json_tree({column}) WHERE type NOT IN ('object', 'array'))")
+
+
+def _join(*parts):
+    return " || ' ' || ".join(f"coalesce({p}, '')" for p in parts)
+
+
+# kind -> (code, model, asset_id SQL, title SQL, body SQL)
+SOURCES = {
+    'asset': (1, Asset, 'id', 'name', _join('asset_type', _json_text('attributes'))),
+    'pin': (2, LocationPoint, 'asset_id', 'label', _join('description')),
+    'structure': (3, PropertyStructure, 'asset_id', 'name', _join('structure_type', 'description', 'notes')),
+    'bill': (4, RecurringBill, 'asset_id', 'name', _join('payee', 'account_number', 'frequency', 'notes')),
+    'vendor': (5, AssetVendor, 'asset_id', 'role', _join('notes')),
+    'person': (6, Person, 'NULL', 'name', _join('role', 'email', 'phone', _json_text('attributes'))),
+}
+KIND_SPAN = 8
+
+_KIND_OF_MODEL = {model: kind for kind, (_, model, _, _, _) in SOURCES.items()}
+_KIND_OF_TABLE = {model.__tablename__: kind for kind, (_, model, _, _, _) in SOURCES.items()}
+
+ALL_RECORDS = 'all'
+_PENDING = 'search_pending'
+
+# Markers FTS5 puts around matches; swapped for <mark> after HTML-escaping
+_HIT_START, _HIT_END = '\x02', '\x03'
+
+
+def reindex(kind, ids=None):
+    """Rebuild the documents of one kind (ids=None: every record of that kind)."""
+    code, model, asset_id, title, body = SOURCES[kind]
+    insert = (f"INSERT INTO {SEARCH_TABLE} (rowid, kind, asset_id, title, body) "
+              f"SELECT id * {KIND_SPAN} + {code}, '{kind}', {asset_id}, {title}, {body} "
+              f"FROM {model.__tablename__}")
+
+    if ids is None:
+        db.session.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE kind = :kind"), {'kind': kind})
+        db.session.execute(text(insert))
+        return
+
+    rowids = [i * KIND_SPAN + code for i in ids]
+    db.session.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN :rowids").bindparams(bindparam('rowids', expanding=True)),
+        {'rowids': rowids}
+    )
+    db.session.execute(
+        text(f"{insert} WHERE id IN :ids").bindparams(bindparam('ids', expanding=True)),
+        {'ids': list(ids)}
+    )
+
+
+def rebuild_search_index():
+    """Re-create every document (restores, repairs, databases that predate the index)."""
+    db.session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    for kind in SOURCES:
+        reindex(kind)
+
+
+def _match_expression(query):
+    """User text -> FTS5 query: every word must match, as a prefix. Operators are not exposed."""
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{w}"*' for w in words)
+
+
+def _highlight(fragment):
+    return Markup(str(escape(fragment or ''))
+                  .replace(_HIT_START, '<mark>').replace(_HIT_END, '</mark>'))
+
+
+def search(query, limit=50):
+    """
+    Ranked matches for free text, best first (bm25, titles weigh more).
+    Returns [{'kind', 'id', 'asset_id', 'asset_name', 'title', 'snippet'}, ...]
+    with title/snippet as safe HTML, matches wrapped in <mark>.
+    """
+    expression = _match_expression(query)
+    if not expression:
+        return []
+
+    rows = db.session.execute(text(
+        f"SELECT s.kind, s.rowid / {KIND_SPAN} AS id, s.asset_id, asset.name AS asset_name, "
+        f"highlight({SEARCH_TABLE}, 2, :start, :end) AS title, "
+        f"snippet({SEARCH_TABLE}, 3, :start, :end, '…', 16) AS snippet "
+        f"FROM {SEARCH_TABLE} AS s LEFT JOIN asset ON asset.id = s.asset_id "
+        f"WHERE {SEARCH_TABLE} MATCH :expression "
+        f"ORDER BY bm25({SEARCH_TABLE}, 0, 0, 10.0, 1.0) LIMIT :limit"
+    ), {'start': _HIT_START, 'end': _HIT_END, 'expression': expression, 'limit': limit}).all()
+
+    return [{
+        'kind': r.kind,
+        'id': r.id,
+        'asset_id': r.asset_id,
+        'asset_name': r.asset_name,
+        'title': _highlight(r.title),
+        'snippet': _highlight(r.snippet),
+    } for r in rows]
+
+
+# --- WRITE TRACKING ---
+
+def _mark(session, kind, ids):
+    pending = session.info.setdefault(_PENDING, {})
+    if ids == ALL_RECORDS or pending.get(kind) == ALL_RECORDS:
+        pending[kind] = ALL_RECORDS
+    else:
+        pending.setdefault(kind, set()).update(ids)
+
+
+def _apply_pending(session):
+    pending = session.info.pop(_PENDING, None)
+    for kind, ids in (pending or {}).items():
+        reindex(kind, None if ids == ALL_RECORDS else ids)
+
+
+def _collect_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        kind = _KIND_OF_MODEL.get(type(obj))
+        if kind and obj.id is not None:
+            _mark(session, kind, {obj.id})
+
+
+def _reindex_after_flush(session, flush_context):
+    _apply_pending(session)
+
+
+def _reindex_bulk_writes(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return None
+    kind = _KIND_OF_TABLE.get(state.statement.table.name)
+    if kind is None or state.execution_options.get('skip_search_sync'):
+        return None
+
+    # Targeted UPDATE/DELETE: reindex just the matched rows; anything else, the whole kind
+    table = state.statement.table
+    where = None if state.is_insert else state.statement.whereclause
+    if where is not None:
+        touched = set(state.session.scalars(select(table.c.id).where(where)))
+    else:
+        touched = ALL_RECORDS
+
+    result = state.invoke_statement()
+    _mark(state.session, kind, touched)
+    _apply_pending(state.session)
+    return result
+
+
+_HOOKS = [
+    ('after_flush', _collect_changes),
+    ('after_flush_postexec', _reindex_after_flush),
+    ('do_orm_execute', _reindex_bulk_writes),
+]
+
+
+def init_search_index(app):
+    # create_all / drop_all (scripts, fresh installs) manage the FTS table too;
+    # migrated databases get it from the 'full text search index' revision.
+    if not event.contains(db.metadata, 'after_create', _create_ddl):
+        event.listen(db.metadata, 'after_create', _create_ddl)
+        event.listen(db.metadata, 'before_drop', _drop_ddl)
+    for name, fn in _HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
@@ -0,0 +1,162 @@
+import numpy as np
+
+# Array helpers for chart series. A "series" here is a sorted list of
+# (date, value) steps; all series of a chart share one date axis and are
+# forward-filled onto it in a single matrix operation.
+
+
+def to_datetimes(dates):
+    return np.array(dates, dtype='datetime64[D]')
+
+
+def date_axis(*series_list, extra_dates=()):
+    """Sorted, de-duplicated union of every date in the given series (plus extra_dates)."""
+    dates = [d for series in series_list for d, _ in series]
+    dates.extend(extra_dates)
+    return np.unique(to_datetimes(dates))
+
+
+def forward_fill(axis, series_list):
+    """
+    Returns a (len(series_list), len(axis)) float matrix where each row carries
+    the last known value of its series forward; 0.0 before the first point.
+    """
+    matrix = np.full((len(series_list), len(axis)), np.nan)
+    if not len(axis):
+        return matrix
+
+    rows, dates, values = [], [], []
+    for row, series in enumerate(series_list):
+        for d, v in series:
+            rows.append(row)
+            dates.append(d)
+            values.append(v)
+    if rows:
+        cols = np.searchsorted(axis, to_datetimes(dates))
+        matrix[np.array(rows), cols] = values
+
+    # Index of the last filled column at or before each position
+    filled = ~np.isnan(matrix)
+    last_idx = np.where(filled, np.arange(len(axis)), 0)
+    np.maximum.accumulate(last_idx, axis=1, out=last_idx)
+    matrix = np.take_along_axis(matrix, last_idx, axis=1)
+    return np.nan_to_num(matrix, nan=0.0)
+
+
+def lttb_indices(values, max_points):
+    """Largest-Triangle-Three-Buckets: indices of max_points samples that keep the visual shape."""
+    n = len(values)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    y = np.asarray(values, dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+
+    keep = np.empty(max_points, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+    prev = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        nxt_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:nxt_end].mean()
+        avg_y = y[end:nxt_end].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+def monthly_indices(axis):
+    """Last sample of every calendar month (plus the very first sample)."""
+    if not len(axis):
+        return np.arange(0)
+    months = axis.astype('datetime64[M]')
+    month_end = np.flatnonzero(np.r_[months[1:] != months[:-1], True])
+    return np.unique(np.r_[0, month_end])
+
+
+def downsample_indices(axis, reference, max_points, method='lttb'):
+    """
+    Pick which axis positions to send to the browser. The same indices are
+    applied to every series so stacked charts stay aligned.
+    """
+    if method == 'monthly':
+        keep = monthly_indices(axis)
+        if len(keep) > max_points:
+            keep = keep[lttb_indices(np.asarray(reference)[keep], max_points)]
+        return keep
+    return lttb_indices(reference, max_points)
+
+
+def iso_dates(axis):
+    return np.datetime_as_string(axis, unit='D').tolist()
+
+
+# --- BUCKETING ---
+# Range queries (API): every series is sampled at the end of each calendar
+# bucket, carrying the last known value forward. All series are answered in
+# one vectorised searchsorted, so the cost depends on the number of stored
+# points and buckets, not on the length of the range in days.
+
+RESOLUTIONS = ('day', 'week', 'month', 'quarter', 'year')
+
+
+def bucket_ends(start, end, resolution):
+    """Last day of every `resolution` bucket overlapping [start, end]; the final bucket is cut at end."""
+    start, end = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    if end < start:
+        return np.array([], dtype='datetime64[D]')
+
+    if resolution == 'day':
+        ends = np.arange(start, end + 1)
+    elif resolution == 'week':
+        # ISO weeks, Monday to Sunday (numpy's day 0, 1970-01-01, was a Thursday)
+        first_sunday = start + (6 - (start.astype(int) + 3) % 7)
+        ends = np.arange(first_sunday, end + 7, 7)
+    elif resolution in ('month', 'quarter'):
+        step = 1 if resolution == 'month' else 3
+        first = start.astype('datetime64[M]')
+        first -= first.astype(int) % step
+        months = np.arange(first, end.astype('datetime64[M]') + 1, step)
+        ends = (months + step).astype('datetime64[D]') - 1
+    elif resolution == 'year':
+        years = np.arange(start.astype('datetime64[Y]'), end.astype('datetime64[Y]') + 1)
+        ends = (years + 1).astype('datetime64[D]') - 1
+    else:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    return np.minimum(ends, end)
+
+
+def sample_at(axis, rows, dates, values, row_count):
+    """
+    Step-sample many series at the dates in `axis` in one pass.
+    rows/dates/values are parallel sequences of points (series index, date, value);
+    returns a (row_count, len(axis)) matrix, 0.0 before a series' first point.
+    Points sharing a row and date: the last one given wins.
+    """
+    matrix = np.zeros((row_count, len(axis)))
+    if not len(rows) or not len(axis):
+        return matrix
+
+    # One sorted key space: (row, day). Searching (row, axis day) for every
+    # row finds each series' last point at or before each sample date.
+    days = to_datetimes(dates).astype(np.int64)
+    sample_days = axis.astype(np.int64)
+    offset = min(days.min(), sample_days.min())
+    span = max(days.max(), sample_days.max()) - offset + 1
+    keys = np.asarray(rows, dtype=np.int64) * span + (days - offset)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    values = np.asarray(values, dtype=float)[order]
+
+    series_index = np.arange(row_count)[:, None]
+    idx = np.searchsorted(keys, series_index * span + (sample_days - offset), side='right') - 1
+    valid = (idx >= 0) & (keys[np.maximum(idx, 0)] // span == series_index)
+    matrix[valid] = values[idx[valid]]
+    return matrix
@@ -0,0 +1,187 @@
+import os
+import re
+import gzip
+import time
+import shutil
+import sqlite3
+from datetime import datetime
+import click
+from flask import current_app
+from src.extensions import db
+
+# Scheduled snapshots of the whole database file, taken outside the web workers
+# by `flask snapshots run` (the `snapshots` service in compose.yaml).
+#   - SQLite's online backup API copies the database a few pages per step and
+#     releases its read lock between steps, so writers are only held up for one
+#     step at a time. A write from another connection mid-copy makes SQLite
+#     restart the copy, so every snapshot is a consistent point in time.
+#   - The copy is checked (quick_check), gzipped and renamed into place, so the
+#     backups folder only ever holds complete snapshots.
+#   - Nothing changed since the last snapshot (same change log id): no snapshot.
+#   - Retention keeps the newest few, then one per day / ISO week / month.
+
+SNAPSHOT_PATTERN = re.compile(r'^estate_(\d{8}-\d{6})_(\d+)\.db\.gz$')
+_STAMP = '%Y%m%d-%H%M%S'
+
+
+def snapshot_dir(app=None):
+    app = app or current_app
+    return app.config['SNAPSHOT_DIR'] or os.path.join(app.instance_path, 'backups')
+
+
+def database_path(app=None):
+    """File path of the SQLite database, or None (in-memory / not SQLite)."""
+    app = app or current_app
+    with app.app_context():
+        url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return None
+    return url.database
+
+
+def list_snapshots(directory):
+    """Snapshots in directory, newest first: [{'name', 'taken_at', 'backup_id', 'size'}, ...]"""
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return []
+    snapshots = []
+    for entry in entries:
+        match = SNAPSHOT_PATTERN.match(entry.name)
+        if match and entry.is_file():
+            snapshots.append({
+                'name': entry.name,
+                'taken_at': datetime.strptime(match.group(1), _STAMP),
+                'backup_id': int(match.group(2)),
+                'size': entry.stat().st_size,
+            })
+    snapshots.sort(key=lambda s: s['taken_at'], reverse=True)
+    return snapshots
+
+
+def retained(snapshots, recent, daily, weekly, monthly):
+    """
+    Names to keep from snapshots (newest first): the newest `recent`, plus the
+    newest of each of the last `daily` days, `weekly` ISO weeks and `monthly` months.
+    """
+    keep = {s['name'] for s in snapshots[:recent]}
+    for count, period in ((daily, lambda t: t.date()),
+                          (weekly, lambda t: t.isocalendar()[:2]),
+                          (monthly, lambda t: (t.year, t.month))):
+        seen = []
+        for s in snapshots:
+            key = period(s['taken_at'])
+            if key not in seen:
+                if len(seen) == count:
+                    break
+                seen.append(key)
+                keep.add(s['name'])
+    return keep
+
+
+def prune_snapshots(directory, config):
+    """Delete snapshots outside the retention rules; returns their names."""
+    snapshots = list_snapshots(directory)
+    keep = retained(snapshots, config['SNAPSHOT_KEEP_RECENT'], config['SNAPSHOT_KEEP_DAILY'],
+                    config['SNAPSHOT_KEEP_WEEKLY'], config['SNAPSHOT_KEEP_MONTHLY'])
+    removed = []
+    for s in snapshots:
+        if s['name'] not in keep:
+            os.remove(os.path.join(directory, s['name']))
+            removed.append(s['name'])
+    return removed
+
+
+def _backup_id(connection):
+    try:
+        return connection.execute("SELECT coalesce(max(seq), 0) FROM change_log").fetchone()[0]
+    except sqlite3.OperationalError:
+        # Database from before the change log
+        return 0
+
+
+def take_snapshot(source_path, directory, pages=256, step_sleep=0.05, force=False):
+    """
+    Copy the database at source_path into directory as estate_<time>_<backup id>.db.gz.
+    Returns the new snapshot's name, or None if nothing changed since the last one
+    (unless force).
+    """
+    os.makedirs(directory, exist_ok=True)
+    source = sqlite3.connect(source_path)
+    try:
+        latest = list_snapshots(directory)[:1]
+        current = _backup_id(source)
+        if latest and not force and current and latest[0]['backup_id'] == current:
+            return None
+
+        taken_at = datetime.now()
+        copy_path = os.path.join(directory, f".estate_{taken_at.strftime(_STAMP)}.db.tmp")
+        packed_path = copy_path + '.gz'
+        try:
+            target = sqlite3.connect(copy_path)
+            try:
+                source.backup(target, pages=pages, sleep=step_sleep)
+                check = target.execute("PRAGMA quick_check").fetchone()[0]
+                if check != 'ok':
+                    raise sqlite3.DatabaseError(f"snapshot failed quick_check: {check}")
+                backup_id = _backup_id(target)
+            finally:
+                target.close()
+
+            name = f"estate_{taken_at.strftime(_STAMP)}_{backup_id}.db.gz"
+            with open(copy_path, 'rb') as raw, gzip.open(packed_path, 'wb') as packed:
+                shutil.copyfileobj(raw, packed, 1024 * 1024)
+            os.replace(packed_path, os.path.join(directory, name))
+        finally:
+            for leftover in (copy_path, packed_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+    finally:
+        source.close()
+    return name
+
+
+def run_snapshot(app, force=False):
+    """One scheduled round: snapshot, then apply retention. Returns (name or None, removed names)."""
+    source = database_path(app)
+    if source is None:
+        raise click.ClickException("Snapshots need a file-based SQLite database.")
+    directory = snapshot_dir(app)
+    name = take_snapshot(source, directory, app.config['SNAPSHOT_PAGES_PER_STEP'],
+                         app.config['SNAPSHOT_STEP_SLEEP_MS'] / 1000, force)
+    return name, prune_snapshots(directory, app.config)
+
+
+def init_snapshots(app):
+    @app.cli.group('snapshots')
+    def snapshots_cli():
+        """Scheduled database snapshots (instance/backups)."""
+
+    @snapshots_cli.command('take')
+    @click.option('--force', is_flag=True, help='Snapshot even if nothing changed.')
+    def take_command(force):
+        """Take one snapshot now and apply retention."""
+        name, removed = run_snapshot(app, force)
+        click.echo(f"Snapshot: {name or 'unchanged, skipped'}; removed {len(removed)} old")
+
+    @snapshots_cli.command('run')
+    def run_command():
+        """Take a snapshot every SNAPSHOT_INTERVAL_MINUTES, forever."""
+        interval = app.config['SNAPSHOT_INTERVAL_MINUTES'] * 60
+        click.echo(f"Snapshots: every {interval // 60} min into {snapshot_dir(app)}")
+        while True:
+            started = time.monotonic()
+            try:
+                name, removed = run_snapshot(app)
+                if name:
+                    click.echo(f"Snapshots: wrote {name} in {time.monotonic() - started:.1f}s, "
+                               f"removed {len(removed)} old")
+            except (OSError, sqlite3.Error) as e:
+                click.echo(f"Snapshots: failed: {e}", err=True)
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+
+    @snapshots_cli.command('list')
+    def list_command():
+        """List the snapshots on disk, newest first."""
+        for s in list_snapshots(snapshot_dir(app)):
+            click.echo(f"{s['name']}  {s['size'] / 1024:.0f} KiB")
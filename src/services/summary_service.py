@@ -0,0 +1,45 @@
+from sqlalchemy import select, func, case
+from src.extensions import db
+from src.models import Asset
+
+
+def get_estate_summary():
+    """
+    Headline figures for the whole estate, computed by the database in a
+    single grouped aggregate instead of hydrating every Asset.
+    Returns: {
+        'total_assets': float, 'total_liabilities': float, 'net_worth': float,
+        'trust_count': int, 'asset_count': int,
+        'allocation': [{'asset_type', 'count', 'assets', 'liabilities', 'net'}, ...]  # largest first
+    }
+    """
+    value = func.coalesce(Asset.value_estimated, 0.0)
+    rows = db.session.execute(
+        select(
+            Asset.asset_type,
+            func.count(Asset.id),
+            func.sum(case((value > 0, value), else_=0.0)),
+            func.sum(case((value < 0, value), else_=0.0)),
+            func.sum(case((Asset.is_in_trust.is_(True), 1), else_=0)),
+        ).group_by(Asset.asset_type)
+    ).all()
+
+    allocation = []
+    summary = {'total_assets': 0.0, 'total_liabilities': 0.0, 'trust_count': 0, 'asset_count': 0}
+    for asset_type, count, assets, liabilities, in_trust in rows:
+        summary['total_assets'] += assets
+        summary['total_liabilities'] += liabilities
+        summary['trust_count'] += in_trust
+        summary['asset_count'] += count
+        allocation.append({
+            'asset_type': asset_type or 'Other',
+            'count': count,
+            'assets': assets,
+            'liabilities': liabilities,
+            'net': assets + liabilities,
+        })
+
+    allocation.sort(key=lambda x: abs(x['net']), reverse=True)
+    summary['net_worth'] = summary['total_assets'] + summary['total_liabilities']
+    summary['allocation'] = allocation
+    return summary
@@ -1,5 +1,7 @@
-from datetime import date, datetime
+from datetime import date, timedelta
 from flask import url_for
+from sqlalchemy import select, union_all, literal, null, func, tuple_, type_coerce, Date, Float, Integer, String
+from src.extensions import db
 from src.models import Milestone, Task, RecurringBill, Asset, PropertyStructure, Appraisal
 
 # Define icons here to be available for logic
@@ -14,121 +16,221 @@ ASSET_ICONS = {
     'Other': '📦'
 }
 
-def get_timeline_events(filter_types=None):
+# Filter codes, one per event source (see the chips in timeline.html)
+EVENT_TYPES = ['milestone', 'financial', 'task', 'asset', 'maintenance', 'history']
+
+
+def _event_select(event_date, event_type, ref_id, title, detail=None, amount=None,
+                  asset_id=None, asset_type=None):
+    """One UNION ALL member; every source exposes the same column layout."""
+    return select(
+        type_coerce(event_date, Date).label('date'),
+        literal(event_type, String).label('type'),
+        type_coerce(ref_id, Integer).label('ref_id'),
+        type_coerce(title, String).label('title'),
+        type_coerce(detail if detail is not None else null(), String).label('detail'),
+        type_coerce(amount if amount is not None else null(), Float).label('amount'),
+        type_coerce(asset_id if asset_id is not None else null(), Integer).label('asset_id'),
+        type_coerce(asset_type if asset_type is not None else null(), String).label('asset_type'),
+    )
+
+
+def _in_range(column, start, end, datetime_column=False):
+    """
+    Date window on a source's own column, so each UNION member can use its index.
+    DateTime columns compare against the next day's date (stored text sorts by date first).
     """
-    Aggregates all dated items into a standardized event list.
+    clauses = []
+    if start:
+        clauses.append(column >= start)
+    if end:
+        clauses.append(column < end + timedelta(days=1) if datetime_column else column <= end)
+    return clauses
+
+
+def _sources(filter_types, start=None, end=None):
+    """SELECT per event source, restricted to the requested filter codes and date window."""
+    wanted = set(filter_types or EVENT_TYPES)
+    selects = []
+
+    # 1. MILESTONES
+    if 'milestone' in wanted:
+        d = func.date(Milestone.date_event)
+        selects.append(_event_select(d, 'milestone', Milestone.id, Milestone.title,
+                                     detail=Milestone.description)
+                       .where(Milestone.date_event.is_not(None),
+                              *_in_range(Milestone.date_event, start, end, datetime_column=True)))
+
+    # 2. RECURRING BILLS (Next Due Date)
+    if 'financial' in wanted:
+        selects.append(_event_select(RecurringBill.next_due_date, 'financial', RecurringBill.id, RecurringBill.name,
+                                     detail=RecurringBill.payee, amount=RecurringBill.amount_estimated,
+                                     asset_id=RecurringBill.asset_id)
+                       .where(RecurringBill.next_due_date.is_not(None),
+                              *_in_range(RecurringBill.next_due_date, start, end)))
+
+    # 3. TASKS
+    if 'task' in wanted:
+        d = func.date(Task.due_date)
+        selects.append(_event_select(d, 'task', Task.id, Task.title,
+                                     detail=Task.status, asset_id=Task.asset_id)
+                       .where(Task.due_date.is_not(None),
+                              *_in_range(Task.due_date, start, end, datetime_column=True)))
+
+    # 4A. PURCHASES (Asset.purchase_date: indexed, generated from the attributes JSON)
+    if 'asset' in wanted:
+        selects.append(_event_select(Asset.purchase_date, 'asset', Asset.id, Asset.name,
+                                     asset_id=Asset.id, asset_type=Asset.asset_type)
+                       .where(Asset.purchase_date.is_not(None),
+                              *_in_range(Asset.purchase_date, start, end)))
+
+    # 4B. APPRAISALS (History)
+    if 'history' in wanted:
+        selects.append(_event_select(Appraisal.date, 'history', Appraisal.id, Asset.name,
+                                     detail=Appraisal.source, amount=Appraisal.value,
+                                     asset_id=Asset.id, asset_type=Asset.asset_type)
+                       .join(Asset, Asset.id == Appraisal.asset_id)
+                       .where(*_in_range(Appraisal.date, start, end)))
+
+    # 5. MAINTENANCE (Structures)
+    if 'maintenance' in wanted:
+        selects.append(_event_select(PropertyStructure.date_last_maintained, 'maintenance', PropertyStructure.id,
+                                     PropertyStructure.name, detail=PropertyStructure.notes,
+                                     asset_id=PropertyStructure.asset_id)
+                       .where(PropertyStructure.date_last_maintained.is_not(None),
+                              *_in_range(PropertyStructure.date_last_maintained, start, end)))
+
+    return selects
+
+
+# Placeholder id used to render the asset URL once per request
+_ID_SENTINEL = 987654321
+
+
+def _asset_url_template():
+    """url_for() is resolved once; each event then only formats its id into the string."""
+    prefix, suffix = url_for('main.asset_details', id=_ID_SENTINEL).split(str(_ID_SENTINEL))
+    return prefix + '{}' + suffix
+
+
+def _to_event(row, today, asset_url):
+    """Turn a UNION row into the event dict the templates expect."""
+    icon_char = ASSET_ICONS.get(row.asset_type, '📦')
+    link = asset_url.format(row.asset_id) if row.asset_id else '#'
+
+    if row.type == 'milestone':
+        event = {'description': row.detail, 'type_label': 'Milestone', 'icon': '🚩',
+                 'link': '#', # No edit UI for milestones yet
+                 'is_past': row.date < today}
+    elif row.type == 'financial':
+        event = {'description': f"Payee: {row.detail} (~${row.amount or 0:.0f})", 'type_label': 'Bill Due', 'icon': '💳',
+                 'link': link + '#tab-bills',
+                 'is_past': row.date < today}
+    elif row.type == 'task':
+        event = {'description': f"Status: {row.detail}", 'type_label': 'Task', 'icon': '✅',
+                 'link': link,
+                 'is_past': row.date < today}
+    elif row.type == 'asset':
+        event = {'description': "Acquired for estate.", 'type_label': 'Purchased', 'icon': icon_char,
+                 'link': link,
+                 'is_past': True}
+    elif row.type == 'history':
+        event = {'description': f"Valued at ${row.amount:,.0f} ({row.detail})", 'type_label': 'Appraisal', 'icon': icon_char,
+                 'link': link,
+                 'is_past': True}
+    else:
+        event = {'description': row.detail or "Routine maintenance logged.", 'type_label': 'Maintenance', 'icon': '🛠️',
+                 'link': link + '#tab-structures',
+                 'is_past': True}
+
+    event.update({'date': row.date, 'title': row.title, 'type': row.type, 'ref_id': row.ref_id})
+    return event
+
+
+def encode_cursor(event):
+    """Opaque-ish keyset cursor for the URL: date|type|id of the last event shown."""
+    return f"{event['date'].isoformat()}|{event['type']}|{event['ref_id']}"
+
+
+def decode_cursor(cursor):
+    try:
+        d, event_type, ref_id = cursor.split('|')
+        return date.fromisoformat(d), event_type, int(ref_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def query_timeline(filter_types=None, start=None, end=None, descending=False, after=None, limit=None):
+    """
+    Runs the whole timeline as one UNION ALL query ordered by (date, type, id).
+        start/end: inclusive date range
+        after: keyset cursor (date, type, id); only events strictly past it are returned
+        limit: page size
     Event Structure: {
         'date': date_obj,
         'title': str,
         'description': str,
-        'type': str (financial, asset, maintenance, milestone, task),
-        'type_label': str, # NEW: For UI Badge
+        'type': str (financial, asset, history, maintenance, milestone, task),
+        'type_label': str, # For UI Badge
         'icon': str,
         'link': str,
-        'is_past': bool
+        'is_past': bool,
+        'ref_id': int # id of the source row (cursor tie-breaker)
     }
     """
-    events = []
+    selects = _sources(filter_types, start, end)
+    if not selects:
+        return []
+
+    events = union_all(*selects).subquery('events')
+    stmt = select(events)
+    if start:
+        stmt = stmt.where(events.c.date >= start)
+    if end:
+        stmt = stmt.where(events.c.date <= end)
+
+    key = tuple_(events.c.date, events.c.type, events.c.ref_id)
+    if after:
+        stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
+
+    if descending:
+        stmt = stmt.order_by(events.c.date.desc(), events.c.type.desc(), events.c.ref_id.desc())
+    else:
+        stmt = stmt.order_by(events.c.date, events.c.type, events.c.ref_id)
+    if limit:
+        stmt = stmt.limit(limit)
+
+    today = date.today()
+    asset_url = _asset_url_template()
+    return [_to_event(row, today, asset_url) for row in db.session.execute(stmt)]
+
+
+def get_timeline_page(section, filter_types=None, start=None, end=None, cursor=None, page_size=100):
+    """
+    One page of a timeline section.
+        'history':  events up to today, newest first
+        'upcoming': events after today, soonest first
+    Returns (events, next_cursor) where next_cursor is None on the last page.
+    """
     today = date.today()
-    
-    # 1. MILESTONES
-    if not filter_types or 'milestone' in filter_types:
-        for m in Milestone.query.all():
-            if m.date_event:
-                # Handle datetime vs date
-                d = m.date_event.date() if isinstance(m.date_event, datetime) else m.date_event
-                events.append({
-                    'date': d,
-                    'title': m.title,
-                    'description': m.description,
-                    'type': 'milestone',
-                    'type_label': 'Milestone',
-                    'icon': '🚩',
-                    'link': '#', # No edit UI for milestones yet
-                    'is_past': d < today
-                })
+    if section == 'history':
+        end = min(end, today) if end else today
+        descending = True
+    else:
+        start = max(start, today + timedelta(days=1)) if start else today + timedelta(days=1)
+        descending = False
 
-    # 2. RECURRING BILLS (Next Due Date)
-    if not filter_types or 'financial' in filter_types:
-        for b in RecurringBill.query.filter(RecurringBill.next_due_date != None).all():
-            events.append({
-                'date': b.next_due_date,
-                'title': b.name,
-                'description': f"Payee: {b.payee} (~${b.amount_estimated:.0f})",
-                'type': 'financial',
-                'type_label': 'Bill Due',
-                'icon': '💳',
-                'link': url_for('main.asset_details', id=b.asset_id) + '#tab-bills',
-                'is_past': b.next_due_date < today
-            })
+    if start and end and start > end:
+        return [], None
 
-    # 3. TASKS
-    if not filter_types or 'task' in filter_types:
-        for t in Task.query.filter(Task.due_date != None).all():
-            d = t.due_date.date() if isinstance(t.due_date, datetime) else t.due_date
-            events.append({
-                'date': d,
-                'title': t.title,
-                'description': f"Status: {t.status}",
-                'type': 'task',
-                'type_label': 'Task',
-                'icon': '✅',
-                'link': url_for('main.asset_details', id=t.asset_id) if t.asset_id else '#',
-                'is_past': d < today
-            })
-
-    # 4. ASSET HISTORY (Purchases & Appraisals)
-    if not filter_types or 'history' in filter_types:
-        for a in Asset.query.all():
-            # Get specific icon or default
-            icon_char = ASSET_ICONS.get(a.asset_type, '📦')
-
-            # A. Purchase Date (from attributes)
-            p_date_str = a.attributes.get('purchase_date')
-            if p_date_str:
-                try:
-                    p_date = datetime.strptime(p_date_str, '%Y-%m-%d').date()
-                    events.append({
-                        'date': p_date,
-                        'title': a.name,
-                        'description': f"Acquired for estate.",
-                        'type': 'asset',
-                        'type_label': 'Purchased',
-                        'icon': icon_char, # Updated to match asset
-                        'link': url_for('main.asset_details', id=a.id),
-                        'is_past': True
-                    })
-                except:
-                    pass
-            
-            # B. Appraisals (History)
-            for app in a.appraisals:
-                events.append({
-                    'date': app.date,
-                    'title': a.name,
-                    'description': f"Valued at ${app.value:,.0f} ({app.source})",
-                    'type': 'history',
-                    'type_label': 'Appraisal',
-                    'icon': icon_char, # Updated to match asset
-                    'link': url_for('main.asset_details', id=a.id),
-                    'is_past': True
-                })
+    events = query_timeline(filter_types, start, end, descending=descending,
+                            after=decode_cursor(cursor), limit=page_size + 1)
+    if len(events) > page_size:
+        events = events[:page_size]
+        return events, encode_cursor(events[-1])
+    return events, None
 
-    # 5. MAINTENANCE (Structures)
-    if not filter_types or 'maintenance' in filter_types:
-        for s in PropertyStructure.query.filter(PropertyStructure.date_last_maintained != None).all():
-            events.append({
-                'date': s.date_last_maintained,
-                'title': s.name,
-                'description': s.notes or "Routine maintenance logged.",
-                'type': 'maintenance',
-                'type_label': 'Maintenance',
-                'icon': '🛠️',
-                'link': url_for('main.asset_details', id=s.asset_id) + '#tab-structures',
-                'is_past': True
-            })
-
-    # Sort all events by date
-    events.sort(key=lambda x: x['date'])
-    
-    return events
\ No newline at end of file
+
+def get_timeline_events(filter_types=None):
+    """All events, oldest first (unpaginated)."""
+    return query_timeline(filter_types)
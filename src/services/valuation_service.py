@@ -0,0 +1,341 @@
+from bisect import bisect_right
+from sqlalchemy import event, select, insert, update, delete, exists, func, inspect
+from sqlalchemy.orm import Session
+from src.extensions import db
+from src.models import Asset, Appraisal, ValuationPoint
+from src.services import series_service as series
+
+# The dashboard chart used to rebuild the whole assets x dates matrix from
+# the appraisal log on every request. Instead we keep a persisted step series:
+#   - per asset: one point per distinct appraisal date (last entry of the day wins)
+#   - estate total (asset_id NULL): net worth at every date any asset changed
+# Appraisal writes only touch the rows of the affected asset plus a few
+# range UPDATEs on the total series.
+
+
+def _step_value(points, d):
+    """Value of a sorted [(date, value)] step series at date d (0 before the first point)."""
+    idx = bisect_right([p[0] for p in points], d) - 1
+    return points[idx][1] if idx >= 0 else 0.0
+
+
+def _collapse(rows):
+    """Reduce ordered (date, value) rows to one point per date, last one wins."""
+    points = {}
+    for d, v in rows:
+        points[d] = v
+    return sorted(points.items())
+
+
+def _appraisal_points(asset_id):
+    rows = db.session.execute(
+        select(Appraisal.date, Appraisal.value)
+        .where(Appraisal.asset_id == asset_id)
+        .order_by(Appraisal.date, Appraisal.id)
+    ).all()
+    return _collapse(rows)
+
+
+def _total_before(d):
+    """Net worth recorded on the latest total point strictly before d."""
+    value = db.session.scalar(
+        select(ValuationPoint.value)
+        .where(ValuationPoint.asset_id.is_(None), ValuationPoint.date < d)
+        .order_by(ValuationPoint.date.desc())
+        .limit(1)
+    )
+    return value or 0.0
+
+
+def sync_asset_series(asset_id, points=None):
+    """
+    Bring the stored series of one asset (and the estate total) in line with
+    its appraisals. Runs inside the caller's transaction; the caller commits.
+    Pass points=[] to drop the asset from the series (e.g. before deleting it).
+    """
+    new = _appraisal_points(asset_id) if points is None else list(points)
+    old = [tuple(r) for r in db.session.execute(
+        select(ValuationPoint.date, ValuationPoint.value)
+        .where(ValuationPoint.asset_id == asset_id)
+        .order_by(ValuationPoint.date)
+    ).all()]
+    if old == new:
+        return
+
+    # 1. Make sure the total series has a point at every new date,
+    #    carrying forward the (old) net worth at that moment.
+    new_dates = [d for d, _ in new]
+    existing = set(db.session.scalars(
+        select(ValuationPoint.date)
+        .where(ValuationPoint.asset_id.is_(None), ValuationPoint.date.in_(new_dates))
+    ))
+    missing = [d for d in new_dates if d not in existing]
+    if missing:
+        db.session.execute(insert(ValuationPoint), [
+            {'asset_id': None, 'date': d, 'value': _total_before(d)} for d in missing
+        ])
+
+    # 2. Shift the total by the difference between old and new step functions.
+    #    The difference is constant between consecutive breakpoints.
+    breakpoints = sorted({d for d, _ in old} | set(new_dates))
+    for i, start in enumerate(breakpoints):
+        delta = _step_value(new, start) - _step_value(old, start)
+        if not delta:
+            continue
+        stmt = update(ValuationPoint).where(
+            ValuationPoint.asset_id.is_(None), ValuationPoint.date >= start
+        )
+        if i + 1 < len(breakpoints):
+            stmt = stmt.where(ValuationPoint.date < breakpoints[i + 1])
+        db.session.execute(stmt.values(value=ValuationPoint.value + delta),
+                           execution_options={'synchronize_session': False})
+
+    # 3. Replace the asset's own points.
+    db.session.execute(delete(ValuationPoint).where(ValuationPoint.asset_id == asset_id))
+    if new:
+        db.session.execute(insert(ValuationPoint), [
+            {'asset_id': asset_id, 'date': d, 'value': v} for d, v in new
+        ])
+
+    # 4. Drop total points that no asset references any more.
+    removed = {d for d, _ in old} - set(new_dates)
+    if removed:
+        other = ValuationPoint.__table__.alias('other')
+        db.session.execute(
+            delete(ValuationPoint).where(
+                ValuationPoint.asset_id.is_(None),
+                ValuationPoint.date.in_(removed),
+                ~exists().where(other.c.asset_id.is_not(None), other.c.date == ValuationPoint.date)
+            ),
+            execution_options={'synchronize_session': False}
+        )
+
+
+def drop_asset_series(asset_id):
+    """Remove an asset's contribution from the series. Call before deleting the asset."""
+    sync_asset_series(asset_id, points=[])
+
+
+def rebuild_series():
+    """Recompute every series from the appraisal log (restores, seeds, repairs)."""
+    db.session.execute(delete(ValuationPoint))
+
+    rows = db.session.execute(
+        select(Appraisal.asset_id, Appraisal.date, Appraisal.value)
+        .order_by(Appraisal.asset_id, Appraisal.date, Appraisal.id)
+    ).all()
+
+    by_asset = {}
+    for asset_id, d, v in rows:
+        by_asset.setdefault(asset_id, []).append((d, v))
+
+    asset_rows = []
+    changes = {}
+    for asset_id, appraisal_rows in by_asset.items():
+        previous = 0.0
+        for d, v in _collapse(appraisal_rows):
+            asset_rows.append({'asset_id': asset_id, 'date': d, 'value': v})
+            changes[d] = changes.get(d, 0.0) + (v - previous)
+            previous = v
+
+    total_rows = []
+    running = 0.0
+    for d in sorted(changes):
+        running += changes[d]
+        total_rows.append({'asset_id': None, 'date': d, 'value': running})
+
+    if asset_rows:
+        db.session.execute(insert(ValuationPoint), asset_rows)
+    if total_rows:
+        db.session.execute(insert(ValuationPoint), total_rows)
+
+
+def _series_missing():
+    """True for databases that have appraisals but predate the stored series."""
+    return (not db.session.scalar(select(exists().where(ValuationPoint.id.is_not(None))))
+            and db.session.scalar(select(exists().where(Appraisal.id.is_not(None)))))
+
+
+def get_series():
+    """
+    Returns (totals, per_asset):
+        totals: [(date, net_worth), ...] sorted by date
+        per_asset: {asset_id: [(date, value), ...]}
+    Builds the series on first use for databases that predate it.
+    """
+    rows = db.session.execute(
+        select(ValuationPoint.asset_id, ValuationPoint.date, ValuationPoint.value)
+        .order_by(ValuationPoint.date)
+    ).all()
+
+    if not rows and _series_missing():
+        rebuild_series()
+        db.session.commit()
+        return get_series()
+
+    totals = []
+    per_asset = {}
+    for asset_id, d, v in rows:
+        if asset_id is None:
+            totals.append((d, v))
+        else:
+            per_asset.setdefault(asset_id, []).append((d, v))
+    return totals, per_asset
+
+
+def get_bucketed_series(end, resolution, start=None, asset_id=None):
+    """
+    Valuation series sampled at the end of each bucket of [start, end]
+    (see series_service.bucket_ends), forward-filled from earlier points.
+    start defaults to the first recorded valuation. Restrict to one asset
+    with asset_id (the estate total is then all zeros).
+    Returns (start, axis, totals, asset_ids, matrix): matrix row i is asset_ids[i].
+    """
+    stmt = select(ValuationPoint.asset_id, ValuationPoint.date, ValuationPoint.value).where(ValuationPoint.date <= end)
+    if asset_id is not None:
+        stmt = stmt.where(ValuationPoint.asset_id == asset_id)
+    rows = db.session.execute(stmt).all()
+
+    if not rows and _series_missing():
+        rebuild_series()
+        db.session.commit()
+        return get_bucketed_series(end, resolution, start, asset_id)
+
+    if start is None:
+        start = min((d for _, d, _ in rows), default=end)
+    axis = series.bucket_ends(start, end, resolution)
+
+    asset_ids = sorted({a for a, _, _ in rows if a is not None})
+    row_of = {a: i + 1 for i, a in enumerate(asset_ids)}  # row 0: estate total
+    matrix = series.sample_at(
+        axis,
+        [row_of.get(a, 0) for a, _, _ in rows],
+        [d for _, d, _ in rows],
+        [v for _, _, v in rows],
+        len(asset_ids) + 1,
+    )
+    return start, axis, matrix[0], asset_ids, matrix[1:]
+
+
+# --- LATEST VALUATION TRACKING ---
+# Every appraisal write, ORM or bulk, ends in the same place: the cached
+# columns on Asset (value_estimated, latest_valuation_date, valuation_count)
+# and the valuation series of the touched assets are recomputed in the same
+# transaction. Routes never re-query "latest appraisal" themselves.
+#   - ORM changes: collected in after_flush, applied in after_flush_postexec
+#   - bulk insert/update/delete on the appraisal table: applied right after
+#     the statement (do_orm_execute)
+# Pass execution_options={'skip_valuation_sync': True} to opt out (restore
+# does, then refreshes everything once at the end).
+
+ALL_ASSETS = 'all'
+_PENDING = 'valuation_pending'
+
+# Above this many touched assets a full rebuild is cheaper than per-asset syncs
+BULK_RESYNC_THRESHOLD = 50
+
+CACHED_COLUMNS = ['value_estimated', 'latest_valuation_date', 'valuation_count']
+
+
+def refresh_asset_valuations(asset_ids=None, values=True):
+    """
+    Recompute the cached valuation columns with one correlated UPDATE.
+    asset_ids=None covers every asset. values=False leaves value_estimated
+    alone (only date and count are refreshed). Assets without appraisals
+    keep their current value_estimated.
+    """
+    own = Appraisal.asset_id == Asset.id
+    fields = {
+        'latest_valuation_date': select(func.max(Appraisal.date)).where(own).scalar_subquery(),
+        'valuation_count': select(func.count(Appraisal.id)).where(own).scalar_subquery(),
+    }
+    if values:
+        latest = (select(Appraisal.value).where(own)
+                  .order_by(Appraisal.date.desc(), Appraisal.id.desc()).limit(1).scalar_subquery())
+        fields['value_estimated'] = func.coalesce(latest, Asset.value_estimated)
+
+    stmt = update(Asset).values(**fields)
+    if asset_ids is not None:
+        stmt = stmt.where(Asset.id.in_(asset_ids))
+    # No searchable text changes, so the search index is left alone
+    db.session.execute(stmt, execution_options={'synchronize_session': False, 'skip_search_sync': True})
+
+
+def _mark(session, asset_ids):
+    pending = session.info.get(_PENDING)
+    if asset_ids == ALL_ASSETS or pending == ALL_ASSETS:
+        session.info[_PENDING] = ALL_ASSETS
+    else:
+        session.info.setdefault(_PENDING, set()).update(i for i in asset_ids if i is not None)
+
+
+def _apply_pending(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+
+    if pending == ALL_ASSETS or len(pending) > BULK_RESYNC_THRESHOLD:
+        refresh_asset_valuations()
+        rebuild_series()
+    else:
+        refresh_asset_valuations(pending)
+        for asset_id in sorted(pending):
+            sync_asset_series(asset_id)
+
+    # The UPDATE bypassed the identity map; reload the cached columns on next access
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Asset) and (pending == ALL_ASSETS or obj.id in pending):
+            session.expire(obj, CACHED_COLUMNS)
+
+
+def _collect_appraisal_changes(session, flush_context):
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Appraisal):
+            touched.add(obj.asset_id)
+            # An appraisal moved to another asset also changes the old one
+            touched.update(inspect(obj).attrs.asset_id.history.deleted or ())
+    if touched - {None}:
+        _mark(session, touched)
+
+
+def _sync_after_flush(session, flush_context):
+    _apply_pending(session)
+
+
+def _sync_bulk_appraisal_writes(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return None
+    if state.statement.table.name != Appraisal.__tablename__ or state.execution_options.get('skip_valuation_sync'):
+        return None
+
+    params = state.parameters
+    if state.is_insert:
+        rows = params if isinstance(params, list) else [params or {}]
+        touched = {r['asset_id'] for r in rows} if all('asset_id' in r for r in rows) else ALL_ASSETS
+    else:
+        where = state.statement.whereclause
+        moves = 'asset_id' in state.statement.compile().params or 'asset_id' in (params or {})
+        if where is None or moves:
+            touched = ALL_ASSETS
+        else:
+            touched = set(state.session.scalars(select(Appraisal.asset_id).where(where).distinct()))
+
+    result = state.invoke_statement()
+    _mark(state.session, touched)
+    _apply_pending(state.session)
+    return result
+
+
+_HOOKS = [
+    ('after_flush', _collect_appraisal_changes),
+    ('after_flush_postexec', _sync_after_flush),
+    ('do_orm_execute', _sync_bulk_appraisal_writes),
+]
+
+
+def init_valuation_tracking():
+    """Register the session hooks (once per process; every app shares the Session class)."""
+    for name, fn in _HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
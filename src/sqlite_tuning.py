@@ -0,0 +1,64 @@
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from src.extensions import db
+
+# SQLite engine profile, applied to every new connection.
+#
+# Journal mode stays DELETE by default: WAL needs shared-memory mapping of the
+# -shm file, which fails with "disk I/O error" on Windows Docker bind mounts
+# (see AI_INSTRUCTIONS.md). On a native filesystem set SQLITE_JOURNAL_MODE=WAL
+# so readers in one gunicorn worker keep going while the other one writes.
+# synchronous and mmap_size follow the journal mode unless set explicitly.
+
+# Pragmas read back for the startup log and the performance page
+REPORTED_PRAGMAS = ['journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout', 'foreign_keys']
+
+
+def effective_settings(config):
+    """Pragma name -> value to apply, after env overrides and journal-mode defaults."""
+    journal_mode = config['SQLITE_JOURNAL_MODE'].upper()
+    wal = journal_mode == 'WAL'
+    # busy_timeout first so a journal mode switch waits for other workers' locks
+    return {
+        'busy_timeout': config['SQLITE_BUSY_TIMEOUT_MS'],
+        'journal_mode': journal_mode,
+        'synchronous': (config['SQLITE_SYNCHRONOUS'] or ('NORMAL' if wal else 'FULL')).upper(),
+        'cache_size': -abs(config['SQLITE_CACHE_SIZE_KB']),  # negative = KiB rather than pages
+        'mmap_size': config['SQLITE_MMAP_SIZE'] if config['SQLITE_MMAP_SIZE'] is not None else (268435456 if wal else 0),
+        'temp_store': config['SQLITE_TEMP_STORE'].upper(),
+        'foreign_keys': 'ON' if config['SQLITE_FOREIGN_KEYS'] else 'OFF',
+    }
+
+
+def init_sqlite_tuning(app):
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return
+
+    settings = effective_settings(app.config)
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in settings.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    # Connections opened before the listener existed (by an earlier init step,
+    # say) would keep SQLite's defaults; drop them so every pooled connection
+    # goes through _apply_pragmas
+    engine.dispose()
+
+    # Startup log of what SQLite actually accepted (in-memory databases ignore WAL, etc.)
+    try:
+        with engine.connect() as conn:
+            effective = {name: conn.exec_driver_sql(f'PRAGMA {name}').scalar() for name in REPORTED_PRAGMAS}
+    except OperationalError as e:
+        app.logger.warning("SQLite tuning: could not read back pragmas: %s", e)
+        return
+    app.extensions['sqlite_pragmas'] = effective
+    app.logger.info("SQLite engine profile: %s", ', '.join(f'{k}={v}' for k, v in effective.items()))
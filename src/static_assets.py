@@ -0,0 +1,89 @@
+import os
+import hashlib
+from flask import request, url_for, send_from_directory
+
+# Content-hashed static URLs: url_for('static', filename=...) gains ?v=<hash of
+# the file>, so a changed file gets a new URL and a versioned URL can be cached
+# by the browser "forever". The hash is recomputed only when the file's mtime
+# changes (compose mounts the source, so files can change under a running app).
+
+_hashes = {}
+
+_FINGERPRINTED = ('static', 'vendor_static')
+
+# Third-party browser libraries, served locally so the app works offline.
+# scripts/fetch_vendor.py downloads them (checked against the SHA-256 digests
+# pinned in scripts/vendor.sha256): the Docker build puts them in VENDOR_DIR,
+# outside the source mount, and `make vendor` puts them in src/static/vendor.
+# Until then templates fall back to the pinned CDN URL, with a startup warning.
+VENDOR_SCRIPTS = {
+    'chartjs': ('chart.umd.js',
+                'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js'),
+    'chartjs-adapter-date-fns': ('chartjs-adapter-date-fns.bundle.min.js',
+                                 'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js'),
+}
+
+
+def file_hash(path):
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _hashes.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    _hashes[path] = (mtime, digest)
+    return digest
+
+
+def init_static_assets(app):
+    max_age = app.config['STATIC_MAX_AGE']
+    static_vendor = os.path.join(app.static_folder, 'vendor')
+    vendor_dir = app.config['VENDOR_DIR']
+
+    def local_vendor_file(filename):
+        """(endpoint, url filename) of a local copy, or None."""
+        if os.path.exists(os.path.join(static_vendor, filename)):
+            return 'static', f'vendor/{filename}'
+        if vendor_dir and os.path.exists(os.path.join(vendor_dir, filename)):
+            return 'vendor_static', filename
+        return None
+
+    missing = [name for name, (filename, _) in VENDOR_SCRIPTS.items() if not local_vendor_file(filename)]
+    if missing:
+        app.logger.warning("Static assets: %s not vendored, loading from the CDN instead "
+                           "(run `make vendor` or rebuild the image)", ', '.join(missing))
+
+    if vendor_dir:
+        @app.route('/static/vendor-dist/<path:filename>', endpoint='vendor_static')
+        def _vendor_file(filename):
+            return send_from_directory(vendor_dir, filename)
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint in _FINGERPRINTED and 'filename' in values and 'v' not in values:
+            root = app.static_folder if endpoint == 'static' else vendor_dir
+            digest = file_hash(os.path.join(root, values['filename']))
+            if digest:
+                values['v'] = digest
+
+    @app.template_global()
+    def vendor_url(name):
+        """Fingerprinted local copy of a vendor script, or its CDN URL if not fetched yet."""
+        filename, cdn_url = VENDOR_SCRIPTS[name]
+        local = local_vendor_file(filename)
+        if local:
+            return url_for(local[0], filename=local[1])
+        return cdn_url
+
+    @app.after_request
+    def _cache_static(response):
+        if request.endpoint in _FINGERPRINTED and response.status_code in (200, 304):
+            if request.args.get('v'):
+                response.headers['Cache-Control'] = f'public, max-age={max_age}, immutable'
+            else:
+                # Unversioned URL: let the browser revalidate (ETag / Last-Modified)
+                response.headers['Cache-Control'] = 'no-cache'
+        return response